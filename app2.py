@@ -2,6 +2,8 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 
+from engine import calculate_premium_logic, get_rate_table
+
 # Function to calculate the premium based on actuarial logic
 def calculate_premium():
     try:
@@ -9,24 +11,11 @@ def calculate_premium():
         gender = gender_combo.get().lower()
         coverage = float(coverage_entry.get())
 
-        # Example actuarial logic (simplified)
-        if gender == 'male':
-            if age < 30:
-                premium = coverage * 0.02
-            elif 30 <= age < 50:
-                premium = coverage * 0.03
-            else:
-                premium = coverage * 0.05
-        elif gender == 'female':
-            if age < 30:
-                premium = coverage * 0.015
-            elif 30 <= age < 50:
-                premium = coverage * 0.025
-            else:
-                premium = coverage * 0.04
-        else:
+        # Example actuarial logic (simplified), shared via the rate table
+        if gender not in get_rate_table().gender_codes:
             messagebox.showerror("Error", "Invalid gender selected.")
             return
+        premium = calculate_premium_logic(age, gender, coverage)
 
         result_label.config(text=f"Annual Premium: ${premium:.2f}", foreground="green")
     except ValueError:
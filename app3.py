@@ -2,6 +2,8 @@ from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QLa
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QColor, QPalette
 
+from engine import calculate_premium_logic
+
 # Function to calculate the premium
 def calculate_premium():
     try:
@@ -9,21 +11,8 @@ def calculate_premium():
         gender = gender_combo.currentText().lower()
         coverage = float(coverage_input.text())
 
-        # Example actuarial logic (simplified)
-        if gender == 'male':
-            if age < 30:
-                premium = coverage * 0.02
-            elif 30 <= age < 50:
-                premium = coverage * 0.03
-            else:
-                premium = coverage * 0.05
-        elif gender == 'female':
-            if age < 30:
-                premium = coverage * 0.015
-            elif 30 <= age < 50:
-                premium = coverage * 0.025
-            else:
-                premium = coverage * 0.04
+        # Example actuarial logic (simplified), shared via the rate table
+        premium = calculate_premium_logic(age, gender, coverage)
 
         result_text.setPlainText(f"Annual Premium: ${premium:.2f}")
     except ValueError:
@@ -6,6 +6,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QColor, QPalette
 
+from engine import calculate_premium_logic
+
 
 class ActuarialCalculator(QMainWindow):
     def __init__(self):
@@ -142,10 +144,7 @@ class ActuarialCalculator(QMainWindow):
             gender = self.gender_combo.currentText().lower()
             coverage = float(self.coverage_input.text())
 
-            if gender == 'male':
-                premium = coverage * (0.02 if age < 30 else 0.03 if age < 50 else 0.05)
-            else:
-                premium = coverage * (0.015 if age < 30 else 0.025 if age < 50 else 0.04)
+            premium = calculate_premium_logic(age, gender, coverage)
 
             self.result_text.setPlainText(f"Annual Premium: ${premium:.2f}")
         except ValueError:
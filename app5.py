@@ -1,13 +1,22 @@
+import html
+import os
 import sys
 import logging
+import numpy as np
+import pandas as pd
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton,
     QComboBox, QTextEdit, QHBoxLayout, QFrame, QTabWidget, QTextBrowser, QGridLayout,
-    QMessageBox, QMenuBar, QAction, QStatusBar, QFormLayout, QGroupBox
+    QMessageBox, QMenuBar, QAction, QStatusBar, QFormLayout, QGroupBox,
+    QTableView, QHeaderView, QFileDialog, QProgressBar
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QStandardPaths
 from PyQt5.QtGui import QFont, QColor, QPalette, QIntValidator, QDoubleValidator
 
+from column_cache import read_csv_cached
+from engine import calculate_premium_chunked, calculate_premium_logic, get_rate_table
+from workers import Job
+
 # -----------------------------------------------------------------------------
 # Logging Configuration
 # -----------------------------------------------------------------------------
@@ -17,41 +26,33 @@ logging.basicConfig(
 )
 
 # -----------------------------------------------------------------------------
-# Actuarial Calculation Logic (Model)
+# Column Cache Configuration
 # -----------------------------------------------------------------------------
-def calculate_premium_logic(age: int, gender: str, coverage: float) -> float:
+COLUMN_CACHE_MAX_BYTES = 1 << 30  # least recently opened files are evicted beyond this
+
+def column_cache_dir() -> str:
     """
-    Calculate premium using simplified actuarial logic.
+    Returns the directory of the columnar cache of opened CSV files.
     
-    Parameters:
-        age (int): Age of the applicant.
-        gender (str): Gender of the applicant ('male' or 'female').
-        coverage (float): Coverage amount.
-        
-    Returns:
-        float: Calculated premium.
+    QStandardPaths derives it from the application name, so this must be
+    called once the QApplication exists.
     """
-    gender = gender.lower()
-    if gender == 'male':
-        if age < 30:
-            rate = 0.02
-        elif age < 50:
-            rate = 0.03
-        else:
-            rate = 0.05
-    elif gender == 'female':
-        if age < 30:
-            rate = 0.015
-        elif age < 50:
-            rate = 0.025
-        else:
-            rate = 0.04
-    else:
-        raise ValueError("Invalid gender provided.")
+    return os.path.join(QStandardPaths.writableLocation(QStandardPaths.CacheLocation) or ".", "column_cache")
+
+# -----------------------------------------------------------------------------
+# Data Loading (Model; the pricing logic lives in engine.py)
+# -----------------------------------------------------------------------------
+def load_policy_csv(path: str, cache_dir: str, progress=None, is_cancelled=None):
+    """
+    Loads a CSV through the columnar cache (progress is indeterminate).
     
-    premium = coverage * rate
-    logging.debug(f"Computed premium: {premium} (Rate: {rate})")
-    return premium
+    The read is a single call into the cache or pd.read_csv, so a load cannot
+    be cancelled part-way; the Data tab disables Cancel while it runs. The
+    cache is capped at COLUMN_CACHE_MAX_BYTES.
+    """
+    if progress is not None:
+        progress(0, 0)
+    return read_csv_cached(path, cache_dir, max_bytes=COLUMN_CACHE_MAX_BYTES)
 
 # -----------------------------------------------------------------------------
 # Calculator Tab (View)
@@ -168,9 +169,260 @@ class CalculatorTab(QWidget):
         self.result_display.clear()
         logging.debug("Inputs and results have been reset.")
 
+# -----------------------------------------------------------------------------
+# Lazy Table Model (Model)
+# -----------------------------------------------------------------------------
+class DataFrameTableModel(QAbstractTableModel):
+    """
+    DataFrameTableModel exposes a DataFrame to a QTableView without copying it.
+    
+    Rows are handed to the view in batches through canFetchMore/fetchMore, and
+    cell values are read from the underlying column arrays only when the view
+    paints them, so memory stays flat however many rows the frame holds
+    (including frames whose columns are memory-mapped).
+    """
+    FETCH_BATCH_SIZE = 10_000
+    
+    def __init__(self, df=None, parent=None):
+        super().__init__(parent)
+        self._df = None
+        self._columns = []
+        self._loaded_rows = 0
+        self.set_frame(df if df is not None else pd.DataFrame())
+    
+    def set_frame(self, df):
+        """Replaces the displayed DataFrame."""
+        self.beginResetModel()
+        self._df = df
+        self._columns = [df.iloc[:, i].array for i in range(df.shape[1])]
+        self._loaded_rows = min(self.FETCH_BATCH_SIZE, len(df))
+        self.endResetModel()
+    
+    def frame(self):
+        return self._df
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded_rows
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            value = self._columns[index.column()][index.row()]
+            if pd.isna(value):
+                return ""
+            if isinstance(value, (float, np.floating)):
+                return f"{value:,.2f}"
+            return str(value)
+        if role == Qt.TextAlignmentRole:
+            if pd.api.types.is_numeric_dtype(self._columns[index.column()].dtype):
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return str(self._df.columns[section])
+        return str(section + 1)
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded_rows < len(self._df)
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.FETCH_BATCH_SIZE, len(self._df) - self._loaded_rows)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded_rows, self._loaded_rows + count - 1)
+        self._loaded_rows += count
+        self.endInsertRows()
+
+# -----------------------------------------------------------------------------
+# Data Tab (View)
+# -----------------------------------------------------------------------------
+class DataTab(QWidget):
+    """
+    DataTab loads a policy CSV and shows it, with calculated premiums, in a
+    virtualized table view. Loading and pricing run as background jobs so the
+    window stays responsive.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = DataFrameTableModel(parent=self)
+        self.job = None
+        self.job_cancellable = False
+        self.init_ui()
+    
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setSpacing(10)
+        
+        # Buttons Layout
+        buttons_layout = QHBoxLayout()
+        buttons_layout.setSpacing(20)
+        
+        self.open_button = QPushButton("Open CSV...")
+        self.open_button.setFont(QFont("Arial", 12, QFont.Bold))
+        self.open_button.setStyleSheet(
+            "background-color: #2196F3; color: white; padding: 8px; border-radius: 8px;"
+        )
+        self.open_button.clicked.connect(self.on_open)
+        buttons_layout.addWidget(self.open_button)
+        
+        self.price_button = QPushButton("Calculate Premiums")
+        self.price_button.setFont(QFont("Arial", 12, QFont.Bold))
+        self.price_button.setStyleSheet(
+            "background-color: #4caf50; color: white; padding: 8px; border-radius: 8px;"
+        )
+        self.price_button.setEnabled(False)
+        self.price_button.clicked.connect(self.on_price)
+        buttons_layout.addWidget(self.price_button)
+        
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setFont(QFont("Arial", 12, QFont.Bold))
+        self.cancel_button.setStyleSheet(
+            "background-color: #f44336; color: white; padding: 8px; border-radius: 8px;"
+        )
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.on_cancel)
+        buttons_layout.addWidget(self.cancel_button)
+        
+        layout.addLayout(buttons_layout)
+        
+        # Progress of the running background job
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
+        # Row count label
+        self.summary_label = QLabel("No data loaded.")
+        self.summary_label.setFont(QFont("Arial", 12))
+        layout.addWidget(self.summary_label)
+        
+        # Virtualized table view; fixed row heights keep scrolling O(visible rows)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.model)
+        self.table_view.setFont(QFont("Arial", 11))
+        self.table_view.setAlternatingRowColors(True)
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_view.verticalHeader().setDefaultSectionSize(24)
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table_view)
+        
+        self.setLayout(layout)
+    
+    def set_frame(self, df):
+        """Displays a DataFrame in the table."""
+        self.model.set_frame(df)
+        self.summary_label.setText(f"{len(df):,} rows, {df.shape[1]} columns")
+        self.update_buttons()
+    
+    def update_buttons(self):
+        busy = self.job is not None
+        required = {"age", "gender", "coverage"}
+        self.open_button.setEnabled(not busy)
+        self.price_button.setEnabled(not busy and required.issubset(self.model.frame().columns))
+        self.cancel_button.setEnabled(busy and self.job_cancellable)
+    
+    def start_job(self, job, on_result, description, cancellable=True):
+        """
+        Runs a background job, wiring its signals to the progress bar and on_result.
+        
+        Cancel is only offered when the job checks for cancellation (cancellable).
+        """
+        self.job = job
+        self.job_cancellable = cancellable
+        job.signals.progress.connect(self.on_progress)
+        job.signals.result.connect(on_result)
+        job.signals.error.connect(self.on_job_error)
+        job.signals.cancelled.connect(lambda: self.summary_label.setText(f"{description} cancelled."))
+        job.signals.finished.connect(self.on_job_finished)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        self.summary_label.setText(f"{description}...")
+        self.update_buttons()
+        job.start()
+    
+    def on_progress(self, done, total):
+        if total <= 0:
+            self.progress_bar.setRange(0, 0)  # busy indicator
+        else:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(int(100 * done / total))
+    
+    def on_job_error(self, message):
+        QMessageBox.critical(self, "Background Job Error", f"An error occurred: {message}")
+        self.summary_label.setText("Job failed.")
+    
+    def on_job_finished(self):
+        self.job = None
+        self.progress_bar.setVisible(False)
+        self.update_buttons()
+    
+    def on_cancel(self):
+        """Requests cancellation of the running job."""
+        if self.job is not None:
+            self.job.cancel()
+            self.cancel_button.setEnabled(False)
+    
+    def on_open(self):
+        """Prompts for a CSV file and loads it through the columnar cache."""
+        path, _ = QFileDialog.getOpenFileName(self, "Open Policy CSV", "", "CSV Files (*.csv);;All Files (*)")
+        if not path:
+            return
+        
+        def on_loaded(df):
+            self.set_frame(df)
+            logging.info(f"Loaded {len(df)} rows from {path}")
+        
+        self.start_job(Job(load_policy_csv, path, column_cache_dir()), on_loaded, "Loading", cancellable=False)
+    
+    def on_price(self):
+        """Adds a premium column calculated for every row."""
+        df = self.model.frame()
+        
+        def on_priced(premiums):
+            self.set_frame(df.assign(premium=premiums))
+            logging.info(f"Calculated {len(premiums)} premiums")
+        
+        self.start_job(Job(calculate_premium_chunked, df), on_priced, "Calculating premiums")
+
 # -----------------------------------------------------------------------------
 # Information Tab (View)
 # -----------------------------------------------------------------------------
+def _format_age(age: float) -> str:
+    return f"{age:g}"
+
+def rate_table_html(rates) -> str:
+    """Describes the rates of a RateTable (e.g. rates.csv or PQUERY_RATES) as HTML."""
+    genders = []
+    for gender in rates.genders:
+        items = []
+        for low, high, rate in rates.age_bands(gender):
+            if low is None and high is None:
+                ages = "All ages"
+            elif low is None:
+                ages = f"Age &lt; {_format_age(high)}"
+            elif high is None:
+                ages = f"Age ≥ {_format_age(low)}"
+            else:
+                ages = f"{_format_age(low)} ≤ Age &lt; {_format_age(high)}"
+            items.append(f"<li>{ages}: {rate * 100:g}% of coverage</li>")
+        genders.append(f"<li><strong>{html.escape(gender.capitalize())}:</strong><ul>{''.join(items)}</ul></li>")
+    return (
+        "<p>This calculator uses simplified actuarial logic to estimate insurance premiums "
+        "based on age, gender, and coverage amount.</p>"
+        f"<h3>Calculation Logic:</h3><ul>{''.join(genders)}</ul>"
+        "<p><i>Please note:</i> This model is simplified and should not be used for actual "
+        "underwriting purposes.</p>"
+    )
+
 class InfoTab(QWidget):
     """
     InfoTab displays information about the actuarial logic used.
@@ -193,27 +445,7 @@ class InfoTab(QWidget):
         info_browser.setStyleSheet(
             "background-color: white; border: 1px solid #cccccc; border-radius: 8px; padding: 15px;"
         )
-        info_browser.setHtml("""
-            <p>This calculator uses simplified actuarial logic to estimate insurance premiums based on age, gender, and coverage amount.</p>
-            <h3>Calculation Logic:</h3>
-            <ul>
-                <li><strong>Male:</strong>
-                    <ul>
-                        <li>Age &lt; 30: 2% of coverage</li>
-                        <li>30 ≤ Age &lt; 50: 3% of coverage</li>
-                        <li>Age ≥ 50: 5% of coverage</li>
-                    </ul>
-                </li>
-                <li><strong>Female:</strong>
-                    <ul>
-                        <li>Age &lt; 30: 1.5% of coverage</li>
-                        <li>30 ≤ Age &lt; 50: 2.5% of coverage</li>
-                        <li>Age ≥ 50: 4% of coverage</li>
-                    </ul>
-                </li>
-            </ul>
-            <p><i>Please note:</i> This model is simplified and should not be used for actual underwriting purposes.</p>
-        """)
+        info_browser.setHtml(rate_table_html(get_rate_table()))
         layout.addWidget(info_browser)
         self.setLayout(layout)
 
@@ -241,11 +473,13 @@ class ActuarialCalculator(QMainWindow):
         # Create Menu Bar
         self.create_menu_bar()
         
-        # Tab Widget with Calculator and Info tabs
+        # Tab Widget with Calculator, Data and Info tabs
         self.tabs = QTabWidget()
         self.calculator_tab = CalculatorTab(self)
+        self.data_tab = DataTab(self)
         self.info_tab = InfoTab(self)
         self.tabs.addTab(self.calculator_tab, "Calculator")
+        self.tabs.addTab(self.data_tab, "Data")
         self.tabs.addTab(self.info_tab, "Info")
         main_layout.addWidget(self.tabs)
         
@@ -0,0 +1,120 @@
+import argparse
+import itertools
+import logging
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from engine import calculate_premium_batch
+from metrics import METRICS
+
+# -----------------------------------------------------------------------------
+# Logging Configuration
+# -----------------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+DEFAULT_CHUNK_SIZE = 500_000
+
+# -----------------------------------------------------------------------------
+# Streaming Batch Pricing
+# -----------------------------------------------------------------------------
+def price_csv(input_path: str, output_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              premium_column: str = "premium") -> int:
+    """
+    Price a policy CSV in fixed-size chunks and stream the results to a CSV file.
+    
+    Only one chunk is held in memory at a time, so peak memory depends on
+    chunk_size rather than on the size of the input file. Age and coverage
+    are read as text and written back unchanged, so the output does not
+    depend on where the chunks fall; they are converted to float64 only for
+    pricing. Rows with a blank age or coverage get a blank premium and are
+    counted in a warning.
+    
+    Parameters:
+        input_path (str): Policy CSV with 'age', 'gender' and 'coverage' columns.
+        output_path (str): Destination CSV; the input columns plus the premium.
+        chunk_size (int): Number of rows read and priced per chunk.
+        premium_column (str): Name of the premium column written to the output.
+        
+    Returns:
+        int: Number of policies priced.
+    """
+    total = 0
+    unpriced = 0
+    reader = pd.read_csv(
+        input_path,
+        chunksize=chunk_size,
+        dtype={"age": str, "gender": "category", "coverage": str},
+    )
+    with reader, open(output_path, "w", newline="") as out:
+        chunks = iter(reader)
+        for i in itertools.count():
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            METRICS.record("csv_parse", time.perf_counter() - start, len(chunk))
+            missing = {"age", "gender", "coverage"} - set(chunk.columns)
+            if missing:
+                raise ValueError(f"Input is missing required columns: {', '.join(sorted(missing))}")
+            chunk[premium_column] = _price_chunk(chunk)
+            unpriced += int(chunk[premium_column].isna().sum())
+            with METRICS.stage("csv_write", rows=len(chunk)):
+                chunk.to_csv(out, header=(i == 0), index=False)
+            total += len(chunk)
+            logging.info("Priced %d policies", total)
+    if unpriced:
+        logging.warning("%d policies have no age or coverage; their premium is left blank", unpriced)
+    return total
+
+def _price_chunk(chunk: pd.DataFrame) -> np.ndarray:
+    """Returns the premiums of a chunk, NaN where age or coverage is blank."""
+    try:
+        # astype parses exactly as float() would, unlike pd.to_numeric.
+        ages = chunk["age"].astype("float64").to_numpy()
+        coverages = chunk["coverage"].astype("float64").to_numpy()
+    except ValueError as e:
+        raise ValueError(f"age and coverage must be numbers: {e}") from None
+    priced = ~(np.isnan(ages) | np.isnan(coverages))
+    if priced.all():
+        return calculate_premium_batch(ages, chunk["gender"], coverages)
+    premiums = np.full(len(chunk), np.nan)
+    premiums[priced] = calculate_premium_batch(ages[priced], chunk["gender"][priced], coverages[priced])
+    return premiums
+
+# -----------------------------------------------------------------------------
+# Main Execution
+# -----------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Price a policy CSV in streaming chunks")
+    parser.add_argument("input", help="Policy CSV with age, gender and coverage columns")
+    parser.add_argument("output", help="CSV file to write priced policies to")
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+        help="Rows per chunk (default: %(default)s)"
+    )
+    parser.add_argument("--premium-column", default="premium", help="Name of the output premium column")
+    parser.add_argument(
+        "--metrics", default=None,
+        help="Write stage metrics to this file (Prometheus text if it ends in .prom, else JSON)"
+    )
+    args = parser.parse_args(argv)
+    if args.metrics:
+        METRICS.enabled = True
+    
+    try:
+        total = price_csv(args.input, args.output, args.chunk_size, args.premium_column)
+    except (OSError, ValueError) as e:
+        logging.error(f"Batch pricing failed: {e}")
+        return 1
+    logging.info(f"Wrote {total} priced policies to {args.output}")
+    if args.metrics:
+        METRICS.write(args.metrics)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from batch_price import price_csv
+from column_cache import read_csv_cached
+from read_folder import read_folder
+
+def test_read_csv(benchmark, portfolio_csv, rows):
+    benchmark.extra_info["rows"] = rows
+    benchmark.pedantic(pd.read_csv, args=(portfolio_csv,), rounds=3)
+
+def test_read_csv_cached_reopen(benchmark, portfolio_csv, rows, tmp_path):
+    read_csv_cached(portfolio_csv, str(tmp_path))  # populate the cache
+    benchmark.extra_info["rows"] = rows
+    benchmark(read_csv_cached, portfolio_csv, str(tmp_path))
+
+def test_batch_price_csv(benchmark, portfolio_csv, rows, tmp_path):
+    benchmark.extra_info["rows"] = rows
+    benchmark.pedantic(price_csv, args=(portfolio_csv, str(tmp_path / "priced.csv")), rounds=3)
+
+def test_folder_combine_distinct(benchmark, policy_folder):
+    benchmark.pedantic(read_folder, args=(policy_folder,), rounds=3)
+
+def test_folder_combine_distinct_cached(benchmark, policy_folder, tmp_path):
+    read_folder(policy_folder, cache_dir=str(tmp_path))  # populate the manifest cache
+    benchmark.pedantic(read_folder, args=(policy_folder,), kwargs={"cache_dir": str(tmp_path)}, rounds=3)
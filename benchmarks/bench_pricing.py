@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from conftest import make_portfolio
+from engine import calculate_premium_batch, calculate_premium_chunked, calculate_premium_logic, get_rate_table
+from parallel_pricing import calculate_premium_parallel
+
+def test_scalar_per_call(benchmark):
+    benchmark(calculate_premium_logic, 42, "Male", 250_000.0)
+
+def test_scalar_loop(benchmark):
+    rows = list(make_portfolio(100_000).itertuples(index=False, name=None))
+    
+    def price_all():
+        return [calculate_premium_logic(age, gender, coverage) for age, gender, coverage in rows]
+    
+    benchmark.extra_info["rows"] = len(rows)
+    benchmark(price_all)
+
+def test_batch_labels(benchmark, portfolio, rows):
+    benchmark.extra_info["rows"] = rows
+    benchmark(calculate_premium_batch, portfolio)
+
+def test_batch_categorical(benchmark, portfolio, rows):
+    df = portfolio.astype({"gender": "category"})
+    benchmark.extra_info["rows"] = rows
+    benchmark(calculate_premium_batch, df)
+
+def test_batch_codes(benchmark, portfolio, rows):
+    rates = get_rate_table()
+    ages = portfolio["age"].to_numpy()
+    codes = rates.encode_genders(portfolio["gender"].to_numpy())
+    coverages = portfolio["coverage"].to_numpy()
+    benchmark.extra_info["rows"] = rows
+    benchmark(rates.premiums, ages, codes, coverages)
+
+def test_chunked(benchmark, portfolio, rows):
+    benchmark.extra_info["rows"] = rows
+    benchmark(calculate_premium_chunked, portfolio)
+
+def test_parallel_shared_memory(benchmark, portfolio, rows):
+    benchmark.extra_info["rows"] = rows
+    benchmark.pedantic(calculate_premium_parallel, args=(portfolio,), kwargs={"shard_rows": 250_000}, rounds=3)
@@ -0,0 +1,58 @@
+"""
+Benchmark suite for premium pricing and CSV ingestion (pytest-benchmark).
+
+Run from the repository root, saving results so later runs can be compared:
+
+    pytest benchmarks/bench_*.py --benchmark-autosave
+    pytest benchmarks/bench_*.py --benchmark-compare --benchmark-compare-fail=mean:10%
+
+Saved runs accumulate under .benchmarks/, keyed by machine and commit.
+Portfolio sizes default to 1e5 and 1e6 rows; pass e.g.
+--bench-rows 1e5,1e6,1e7,1e8 for the full range (large files are written
+once per session into a temporary directory).
+"""
+import os
+import sys
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_data import generate_portfolio, write_csv, write_folder
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-rows", default="1e5,1e6",
+        help="Comma-separated portfolio sizes for the batch and CSV benchmarks"
+    )
+    parser.addoption(
+        "--bench-files", type=int, default=200,
+        help="Number of files in the folder-combine benchmark"
+    )
+
+def pytest_generate_tests(metafunc):
+    if "rows" in metafunc.fixturenames:
+        sizes = [int(float(size)) for size in metafunc.config.getoption("bench_rows").split(",")]
+        metafunc.parametrize("rows", sizes, ids=[f"{size:.0e}" for size in sizes], scope="session")
+
+def make_portfolio(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Returns a synthetic portfolio with age, gender and coverage columns."""
+    return generate_portfolio(rows, seed).drop(columns="policy_id")
+
+@pytest.fixture(scope="session")
+def portfolio(rows):
+    return make_portfolio(rows)
+
+@pytest.fixture(scope="session")
+def portfolio_csv(rows, tmp_path_factory):
+    """Path of a synthetic policy CSV with the requested number of rows."""
+    path = tmp_path_factory.mktemp("csv") / f"portfolio-{rows}.csv"
+    return write_csv(str(path), rows)
+
+@pytest.fixture(scope="session")
+def policy_folder(request, tmp_path_factory):
+    """Folder of cp1252 CSVs in the read_folder.txt layout, with 10% duplicate rows."""
+    folder = tmp_path_factory.mktemp("folder")
+    n_files = request.config.getoption("bench_files")
+    write_folder(str(folder), n_files * 1_000, n_files, dup_rate=0.1)
+    return str(folder)
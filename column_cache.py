@@ -0,0 +1,227 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+from metrics import METRICS
+
+# -----------------------------------------------------------------------------
+# Column Cache Configuration
+# -----------------------------------------------------------------------------
+CACHE_VERSION = 2
+META_NAME = "meta.json"
+
+# -----------------------------------------------------------------------------
+# Source Fingerprints
+# -----------------------------------------------------------------------------
+def source_key(path: str, options: dict = None) -> str:
+    """
+    Returns a cache key for a source file from its path, size and modification
+    time plus any parse options the cached table depends on.
+    """
+    st = os.stat(path)
+    fingerprint = json.dumps(
+        [os.path.abspath(path), st.st_size, st.st_mtime_ns, options or {}],
+        sort_keys=True, default=str,
+    )
+    return hashlib.blake2b(fingerprint.encode("utf-8"), digest_size=20).hexdigest()
+
+# -----------------------------------------------------------------------------
+# Columnar Table Cache
+# -----------------------------------------------------------------------------
+def _save_values(base: str, values: np.ndarray) -> str:
+    """
+    Save the distinct values of a column, returning their storage format.
+    
+    Strings are stored variable-length, as one UTF-8 text with the values
+    separated by NUL characters, so one long value does not widen all the
+    others. Anything else (including strings containing NUL) is saved as
+    an .npy array.
+    """
+    values = np.asarray(values)
+    if (len(values) and values.dtype == object
+            and all(isinstance(v, str) and "\0" not in v for v in values)):
+        with open(base + ".utf8", "wb") as f:
+            f.write("\0".join(values).encode("utf-8", "surrogatepass"))
+        return "utf8"
+    np.save(base + ".npy", values, allow_pickle=values.dtype == object)
+    return "npy"
+
+def _load_values(base: str, storage: str) -> np.ndarray:
+    """Load distinct values saved by _save_values."""
+    if storage != "utf8":
+        return np.load(base + ".npy", allow_pickle=True)
+    with open(base + ".utf8", "rb") as f:
+        strings = f.read().decode("utf-8", "surrogatepass").split("\0")
+    values = np.empty(len(strings), dtype=object)
+    values[:] = strings
+    return values
+
+class ColumnCache:
+    """
+    ColumnCache stores parsed tables as one .npy file per column.
+    
+    Numeric, boolean and datetime columns are saved as raw arrays and
+    memory-mapped on reload, so opening them copies no data. Text and
+    categorical columns are saved as integer codes plus their distinct
+    values, with strings stored variable-length. Their codes are
+    memory-mapped as well; categoricals reuse them directly, but text
+    columns are rebuilt with one take over the distinct values on every
+    read, so an all-text table costs a copy of its values to reopen
+    (still well below a parse).
+    """
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+    
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self._entry_dir(key), META_NAME))
+    
+    def keys(self) -> list:
+        """Returns the keys of every cached table."""
+        return [key for key in os.listdir(self.cache_dir) if key in self]
+    
+    def size(self, key: str) -> int:
+        """Returns the bytes a cached table occupies on disk."""
+        entry_dir = self._entry_dir(key)
+        return sum(os.path.getsize(os.path.join(entry_dir, name)) for name in os.listdir(entry_dir))
+    
+    def touch(self, key: str):
+        """Marks a cached table as just used, so evict() removes it last."""
+        os.utime(os.path.join(self._entry_dir(key), META_NAME))
+    
+    def evict(self, max_bytes: int, keep=()) -> list:
+        """
+        Deletes the least recently used tables until the cache fits in max_bytes.
+        
+        Parameters:
+            max_bytes (int): Size the cache may occupy on disk.
+            keep (iterable): Keys that are never evicted, e.g. the table just opened.
+            
+        Returns:
+            list: Keys of the deleted tables.
+        """
+        entries = []
+        for key in self.keys():
+            try:
+                used = os.stat(os.path.join(self._entry_dir(key), META_NAME)).st_mtime_ns
+                entries.append((used, key, self.size(key)))
+            except FileNotFoundError:  # removed concurrently
+                continue
+        total = sum(size for _, _, size in entries)
+        keep = set(keep)
+        evicted = []
+        for _, key, size in sorted(entries):
+            if total <= max_bytes:
+                break
+            if key in keep:
+                continue
+            self.remove(key)
+            total -= size
+            evicted.append(key)
+        if evicted:
+            logging.info(f"Evicted {len(evicted)} tables from the column cache {self.cache_dir}")
+        return evicted
+    
+    def write(self, key: str, df: pd.DataFrame):
+        """Writes a table to the cache under key, replacing any existing entry."""
+        tmp_dir = tempfile.mkdtemp(prefix=f".{key}-", dir=self.cache_dir)
+        try:
+            columns = []
+            for i, name in enumerate(df.columns):
+                series = df.iloc[:, i]
+                dtype = series.dtype
+                base = os.path.join(tmp_dir, f"col{i:05d}")
+                if isinstance(dtype, pd.CategoricalDtype):
+                    kind = "category"
+                    np.save(base + ".codes.npy", series.cat.codes.to_numpy())
+                    storage = _save_values(base + ".values", dtype.categories.to_numpy())
+                elif isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+                    kind = "array"
+                    storage = None
+                    np.save(base + ".npy", series.to_numpy())
+                else:
+                    kind = "values"
+                    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+                    np.save(base + ".codes.npy", codes.astype(np.int32 if len(uniques) < 2**31 else np.int64))
+                    storage = _save_values(base + ".values", np.asarray(uniques, dtype=object))
+                columns.append({
+                    "name": name, "kind": kind, "dtype": str(dtype), "storage": storage,
+                    "ordered": bool(getattr(dtype, "ordered", False)),
+                })
+            meta = {"version": CACHE_VERSION, "rows": len(df), "columns": columns}
+            with open(os.path.join(tmp_dir, META_NAME), "w", encoding="utf-8") as f:
+                json.dump(meta, f, default=str)
+            self.remove(key)
+            os.replace(tmp_dir, self._entry_dir(key))
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+    
+    def read(self, key: str) -> pd.DataFrame:
+        """Opens a cached table, memory-mapping its column arrays."""
+        start = time.perf_counter()
+        entry_dir = self._entry_dir(key)
+        with open(os.path.join(entry_dir, META_NAME), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != CACHE_VERSION:
+            raise ValueError(f"Unsupported column cache version in {entry_dir}")
+        
+        data = {}
+        for i, column in enumerate(meta["columns"]):
+            base = os.path.join(entry_dir, f"col{i:05d}")
+            if column["kind"] == "array":
+                data[i] = np.load(base + ".npy", mmap_mode="r")
+                continue
+            codes = np.load(base + ".codes.npy", mmap_mode="r")
+            values = _load_values(base + ".values", column["storage"])
+            if column["kind"] == "category":
+                data[i] = pd.Categorical.from_codes(codes, values, ordered=column["ordered"])
+            else:
+                # A trailing null lets the missing-value code -1 take it directly.
+                values = np.append(np.asarray(values, dtype=object), np.nan)
+                data[i] = pd.array(values.take(codes), dtype=column["dtype"])
+        df = pd.DataFrame(data, copy=False)
+        df.columns = [column["name"] for column in meta["columns"]]
+        METRICS.record("cache_read", time.perf_counter() - start, len(df))
+        return df
+    
+    def remove(self, key: str):
+        """Deletes a cached table if present."""
+        shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+def read_csv_cached(path: str, cache_dir: str, max_bytes: int = None, **read_csv_kwargs) -> pd.DataFrame:
+    """
+    Read a CSV file through a ColumnCache.
+    
+    The first open parses the file with pd.read_csv and caches the result;
+    later opens of the unchanged file memory-map the cached columns instead of
+    parsing the text again. With max_bytes, the least recently opened tables
+    are evicted whenever the cache grows beyond that size; the table just
+    opened is always kept.
+    """
+    cache = ColumnCache(cache_dir)
+    key = source_key(path, read_csv_kwargs)
+    df = None
+    if key in cache:
+        try:
+            df = cache.read(key)
+            cache.touch(key)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable cache entry for {path}: {e}")
+    if df is None:
+        with METRICS.stage("csv_parse") as timer:
+            df = pd.read_csv(path, **read_csv_kwargs)
+            timer.rows = len(df)
+        cache.write(key, df)
+    if max_bytes is not None:
+        cache.evict(max_bytes, keep=[key])
+    return df
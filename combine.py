@@ -0,0 +1,199 @@
+"""
+Schema-aligned Table.Combine.
+
+The per-file tables of a folder can have slightly different headers and
+dtypes. Instead of reindexing every table to the union of columns and
+concatenating the copies, combine_tables reads all the schemas first,
+settles every column's name and dtype once, allocates each output column
+once and copies every table straight into its slice. The combined table
+is built in a single linear pass, and a column costs one allocation
+however many files it spans.
+"""
+import numpy as np
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# Unified Schema
+# -----------------------------------------------------------------------------
+_MASKED_NUMBER_PREFIX = {"i": "Int", "u": "UInt", "f": "Float"}
+
+def _number_dtype(dtype):
+    """Returns the NumPy dtype of a NumPy or nullable (masked) number dtype, else None."""
+    if isinstance(dtype, np.dtype):
+        return dtype if dtype.kind in "iuf" else None
+    if isinstance(dtype, pd.CategoricalDtype) or not hasattr(dtype, "numpy_dtype"):
+        return None
+    return dtype.numpy_dtype if dtype.numpy_dtype.kind in "iuf" else None
+
+def _is_bool(dtype) -> bool:
+    return isinstance(dtype, pd.BooleanDtype) or (isinstance(dtype, np.dtype) and dtype.kind == "b")
+
+def combined_dtype(dtypes: list, has_missing: bool):
+    """
+    Returns the dtype of a combined column from the dtypes of its parts.
+    
+    Parameters:
+        dtypes (list): Dtype of the column in every table that has it.
+        has_missing (bool): Whether some non-empty table lacks the column, so
+            its rows must be filled with nulls.
+    """
+    unique = list(dict.fromkeys(dtypes))
+    if all(isinstance(dtype, pd.CategoricalDtype) for dtype in unique):
+        if len(unique) == 1:
+            return unique[0]
+        categories = dict.fromkeys(value for dtype in unique for value in dtype.categories)
+        return pd.CategoricalDtype(list(categories))
+    if len(unique) == 1:
+        dtype = unique[0]
+    elif all(_number_dtype(dtype) is not None for dtype in unique):
+        dtype = np.result_type(*(_number_dtype(dtype) for dtype in unique))
+        if not all(isinstance(dtype, np.dtype) for dtype in unique):
+            # Any nullable part keeps the column nullable, as in pd.concat.
+            return pd.api.types.pandas_dtype(f"{_MASKED_NUMBER_PREFIX[dtype.kind]}{dtype.itemsize * 8}")
+    elif all(_is_bool(dtype) for dtype in unique):
+        return pd.BooleanDtype()
+    else:
+        return np.dtype(object)
+    if has_missing and isinstance(dtype, np.dtype):
+        if dtype.kind in "iu":
+            return np.dtype(np.float64)  # no integer null, as in pd.concat
+        if dtype.kind == "b":
+            return np.dtype(object)
+    return dtype
+
+def _table_schemas(frames: list) -> list:
+    """Returns the (column, dtype) pairs of every table."""
+    return [list(frame.dtypes.items()) for frame in frames]
+
+def _unified_schema(frames: list, schemas: list) -> dict:
+    seen = {}
+    for schema in schemas:
+        for col, dtype in schema:
+            seen.setdefault(col, []).append(dtype)
+    unified = {}
+    for col, dtypes in seen.items():
+        has_missing = any(len(frame) and col not in frame.columns for frame in frames)
+        unified[col] = combined_dtype(dtypes, has_missing)
+    return unified
+
+def unified_schema(frames: list) -> dict:
+    """
+    Collect the schemas of all tables and settle the combined one.
+    
+    Returns:
+        dict: Column name -> dtype, in first-seen column order.
+    """
+    return _unified_schema(frames, _table_schemas(frames))
+
+# -----------------------------------------------------------------------------
+# Preallocated Column Builders
+# -----------------------------------------------------------------------------
+class _NumpyColumn:
+    """A preallocated NumPy column; rows no table fills stay null."""
+    def __init__(self, dtype: np.dtype, rows: int):
+        self.values = np.empty(rows, dtype=dtype)
+        self.filled = np.zeros(rows, dtype=bool)
+
+    def fill(self, start: int, part: pd.Series):
+        self.values[start:start + len(part)] = part.to_numpy(dtype=self.values.dtype, copy=False)
+        self.filled[start:start + len(part)] = True
+
+    def finish(self):
+        if not self.filled.all():
+            null = np.datetime64("NaT") if self.values.dtype.kind in "mM" else np.nan
+            self.values[~self.filled] = null
+        return self.values
+
+class _CategoricalColumn:
+    """A preallocated categorical column, re-coded to the combined categories."""
+    def __init__(self, dtype: pd.CategoricalDtype, rows: int):
+        self.dtype = dtype
+        self.codes = np.full(rows, -1, dtype=np.int32)
+
+    def fill(self, start: int, part: pd.Series):
+        recode = self.dtype.categories.get_indexer(part.cat.categories)
+        codes = part.cat.codes.to_numpy()
+        self.codes[start:start + len(part)] = np.where(codes >= 0, recode[codes], -1)
+
+    def finish(self):
+        return pd.Categorical.from_codes(self.codes, dtype=self.dtype)
+
+class _MaskedColumn:
+    """A preallocated nullable integer, float or boolean column (values plus a null mask)."""
+    def __init__(self, dtype, rows: int):
+        self.dtype = dtype
+        self.values = np.zeros(rows, dtype=dtype.numpy_dtype)
+        self.mask = np.ones(rows, dtype=bool)
+
+    def fill(self, start: int, part: pd.Series):
+        array = part.array
+        self.values[start:start + len(part)] = array.to_numpy(dtype=self.dtype.numpy_dtype, na_value=0)
+        self.mask[start:start + len(part)] = array.isna()
+
+    def finish(self):
+        return self.dtype.construct_array_type()(self.values, self.mask)
+
+class _ObjectBackedColumn:
+    """An extension column (e.g. strings) built from one preallocated object array."""
+    def __init__(self, dtype, rows: int):
+        self.dtype = dtype
+        self.values = np.full(rows, getattr(dtype, "na_value", np.nan), dtype=object)
+
+    def fill(self, start: int, part: pd.Series):
+        self.values[start:start + len(part)] = np.asarray(part.array, dtype=object)
+
+    def finish(self):
+        return self.dtype.construct_array_type()._from_sequence(self.values, dtype=self.dtype)
+
+_MASKED_ARRAYS = (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray)
+
+def _column_builder(dtype, rows: int):
+    if isinstance(dtype, pd.CategoricalDtype):
+        return _CategoricalColumn(dtype, rows)
+    if isinstance(dtype, np.dtype):
+        return _NumpyColumn(dtype, rows)
+    if issubclass(dtype.construct_array_type(), _MASKED_ARRAYS):
+        return _MaskedColumn(dtype, rows)
+    return _ObjectBackedColumn(dtype, rows)
+
+# -----------------------------------------------------------------------------
+# Combine
+# -----------------------------------------------------------------------------
+def combine_tables(frames: list) -> pd.DataFrame:
+    """
+    Union tables by column name, like Table.Combine.
+
+    Columns appear in first-seen order and rows in table order; a table
+    without a column contributes nulls. Parts of one column with different
+    dtypes are reconciled once: numbers widen to a common type (nullable if
+    any part is), categoricals merge their categories, and anything else
+    becomes object. Tables that already share one schema need no alignment
+    and are handed to a single pd.concat.
+
+    Parameters:
+        frames (list): Tables to combine.
+
+    Returns:
+        pd.DataFrame: The combined table with a fresh index.
+    """
+    frames = list(frames)
+    if not frames:
+        return pd.DataFrame()
+    schemas = _table_schemas(frames)
+    if all(schema == schemas[0] for schema in schemas):
+        # Nothing to align: one concat copies each column block in one go.
+        return pd.concat(frames, ignore_index=True, sort=False)
+    if any(frame.columns.has_duplicates for frame in frames):
+        # Columns cannot be matched by name; fall back to positional concat rules.
+        return pd.concat(frames, ignore_index=True, sort=False)
+    schema = _unified_schema(frames, schemas)
+    rows = sum(len(frame) for frame in frames)
+    builders = {col: _column_builder(dtype, rows) for col, dtype in schema.items()}
+    start = 0
+    for frame in frames:
+        if len(frame):
+            for col, part in frame.items():
+                builders[col].fill(start, part)
+        start += len(frame)
+    return pd.DataFrame({col: builder.finish() for col, builder in builders.items()},
+                        index=pd.RangeIndex(rows))
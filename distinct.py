@@ -0,0 +1,273 @@
+import logging
+import os
+import pickle
+import tempfile
+import numpy as np
+import pandas as pd
+
+from combine import combine_tables
+
+# -----------------------------------------------------------------------------
+# Out-of-Core Distinct Configuration
+# -----------------------------------------------------------------------------
+DEFAULT_MEMORY_BUDGET = 1 << 30  # bytes
+DEFAULT_BUCKETS = 64
+MAX_SPILL_DEPTH = 4
+MAX_BUCKETS = 1024  # open spill files per partition pass
+
+# Each spill level re-partitions with a different 16-byte hash key so rows that
+# collided in one level's bucket are spread out at the next.
+_HASH_KEYS = ["pquerydistinct00", "pquerydistinct01", "pquerydistinct02",
+              "pquerydistinct03", "pquerydistinct04"]
+
+KEEP_OPTIONS = ("first", "last")
+
+# -----------------------------------------------------------------------------
+# In-Memory Distinct (vectorized row hashing)
+# -----------------------------------------------------------------------------
+def row_hashes(table: pd.DataFrame, hash_key: str = _HASH_KEYS[0]) -> np.ndarray:
+    """Returns a 64-bit hash of every row, combined column by column in C."""
+    return pd.util.hash_pandas_object(table, index=False, hash_key=hash_key).to_numpy()
+
+def _rows_equal(table: pd.DataFrame, rows: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Compare rows to others position by position, treating nulls as equal."""
+    equal = np.ones(len(rows), dtype=bool)
+    pairs = table.iloc[np.concatenate([rows, others])]
+    for col in pairs.columns:
+        values = pairs[col].to_numpy()
+        a, b = values[:len(rows)], values[len(rows):]
+        same = a == b
+        differ = ~same
+        if differ.any():  # only null checks on the few mismatches: NaN != NaN
+            same[differ] = pd.isna(a[differ]) & pd.isna(b[differ])
+        equal &= same
+    return equal
+
+def _order_key(values: pd.Series) -> pd.Series:
+    """
+    Returns the values to sort on for order_by.
+    
+    read_folder keeps every value as text, and text sorts character by
+    character ('9' after '10'). Text (or text categories) is therefore
+    sorted as numbers, or else as dates, when every non-empty value parses
+    as one; any other text column is rejected rather than sorted as text.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    if not (pd.api.types.is_object_dtype(values.dtype) or pd.api.types.is_string_dtype(values.dtype)):
+        return values
+    text = values.mask(values == "")
+    present = text.notna().to_numpy()
+    numbers = pd.to_numeric(text, errors="coerce")
+    if numbers[present].notna().all():
+        return numbers
+    dates = pd.to_datetime(text, errors="coerce", format="mixed")
+    if dates[present].notna().all():
+        return dates
+    raise ValueError(f"order_by column {values.name!r} must hold numbers or dates")
+
+def distinct_rows(table: pd.DataFrame, keys: list = None, keep: str = "first",
+                  order_by: str = None) -> pd.DataFrame:
+    """
+    Table.Distinct for a table in memory, optionally on a subset of key columns.
+    
+    Rows are reduced to one 64-bit hash of their key columns and duplicates
+    are found on the hashes. Every row dropped as a duplicate is then
+    compared exactly with the row it duplicates, so a hash collision can
+    never drop a distinct row. Surviving rows keep their input order.
+    
+    Parameters:
+        table (pd.DataFrame): Rows to de-duplicate.
+        keys (list): Columns that identify a row (default: all columns).
+        keep (str): 'first' or 'last' row of each key to keep.
+        order_by (str): Column deciding which row is first or last (e.g. a
+            timestamp, with nulls first); ties and the default follow input
+            order, i.e. file order for a combined folder. A text column is
+            compared as numbers or dates (see _order_key).
+        
+    Returns:
+        pd.DataFrame: The de-duplicated table with a fresh index.
+    """
+    if keep not in KEEP_OPTIONS:
+        raise ValueError(f"keep must be one of {KEEP_OPTIONS}, not {keep!r}")
+    keys = list(table.columns) if keys is None else list(keys)
+    missing = [col for col in keys + ([order_by] if order_by else []) if col not in table.columns]
+    if missing:
+        raise ValueError(f"Distinct column(s) {missing} not found")
+    if table.empty:
+        return table.reset_index(drop=True)
+    
+    order = None
+    if order_by:
+        ranked = _order_key(table[order_by].reset_index(drop=True))
+        order = ranked.sort_values(kind="stable", na_position="first").index.to_numpy()
+    keyed = table[keys].reset_index(drop=True)
+    if order is not None:
+        keyed = keyed.iloc[order].reset_index(drop=True)
+    
+    hashes = row_hashes(keyed)
+    kept = ~pd.Series(hashes).duplicated(keep=keep).to_numpy()
+    dropped = np.flatnonzero(~kept)
+    if len(dropped):
+        codes, uniques = pd.factorize(hashes)
+        survivor = np.empty(len(uniques), dtype=np.intp)
+        survivor[codes[kept]] = np.flatnonzero(kept)
+        equal = _rows_equal(keyed, dropped, survivor[codes[dropped]])
+        if not equal.all():
+            # A genuine 64-bit collision: settle the colliding hashes exactly.
+            collided = np.isin(codes, codes[dropped[~equal]])
+            logging.debug("Resolving %d rows with colliding row hashes", collided.sum())
+            kept[collided] = ~keyed[collided].duplicated(keep=keep).to_numpy()
+    
+    positions = np.flatnonzero(kept) if order is None else np.sort(order[kept])
+    return table.iloc[positions].reset_index(drop=True)
+
+# -----------------------------------------------------------------------------
+# Distinct Operator (Table.Distinct with disk spill)
+# -----------------------------------------------------------------------------
+def _frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=False, deep=True).sum())
+
+def _partition(frames, columns: list, n_buckets: int, spill_dir: str, depth: int,
+               seen_columns: dict = None) -> tuple:
+    """
+    Hash every row and append it to one of n_buckets pickle files on disk.
+    
+    Returns:
+        tuple: The bucket paths and the in-memory size of each bucket in
+            bytes (pickles are several times smaller than the loaded
+            tables, so file sizes cannot bound memory). A table's size is
+            split among its buckets by row count.
+    """
+    paths = [os.path.join(spill_dir, f"bucket-{depth}-{i:04d}.pkl") for i in range(n_buckets)]
+    sizes = [0] * n_buckets
+    files = [open(path, "wb") for path in paths]
+    try:
+        for df in frames:
+            if seen_columns is not None:
+                seen_columns.update(dict.fromkeys(df.columns))
+            if df.empty:
+                continue
+            # Hash a fixed column set (missing columns count as nulls) so equal
+            # rows land in the same bucket whichever file they came from.
+            keyed = df.reindex(columns=columns)
+            missing = [col for col in columns if col not in df.columns]
+            if missing:
+                keyed[missing] = keyed[missing].astype(object)
+            hashes = pd.util.hash_pandas_object(
+                keyed, index=False, hash_key=_HASH_KEYS[depth]
+            ).to_numpy()
+            buckets = hashes % np.uint64(n_buckets)
+            order = np.argsort(buckets, kind="stable")
+            bounds = np.searchsorted(buckets[order], np.arange(n_buckets + 1))
+            row_bytes = _frame_bytes(df) / len(df)
+            for bucket in range(n_buckets):
+                start, end = bounds[bucket], bounds[bucket + 1]
+                if start < end:
+                    pickle.dump(df.iloc[order[start:end]], files[bucket],
+                                protocol=pickle.HIGHEST_PROTOCOL)
+                    sizes[bucket] += int(row_bytes * (end - start))
+    finally:
+        for f in files:
+            f.close()
+    return paths, sizes
+
+def _load_bucket(path: str):
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+def _split_count(size: int, memory_budget: int) -> int:
+    """Buckets needed for size bytes of rows to load within memory_budget, with room for skew."""
+    needed = -(-2 * size // max(1, memory_budget))  # ceil(2 * size / memory_budget)
+    return min(MAX_BUCKETS, max(2, 2 * needed))
+
+def _distinct_buckets(paths: list, sizes: list, key_columns: list, columns: list,
+                      memory_budget: int, spill_dir: str, depth: int, dedupe):
+    for path, size in zip(paths, sizes):
+        if size == 0:
+            os.remove(path)
+            continue
+        # Loading holds the pieces and their concatenation at once.
+        if 2 * size > memory_budget and depth + 1 < min(MAX_SPILL_DEPTH, len(_HASH_KEYS)):
+            # Too large (e.g. a skewed bucket): split it again rather than loading it whole.
+            n_buckets = _split_count(size, memory_budget)
+            logging.debug("Re-partitioning %s (%d bytes in memory) into %d buckets at depth %d",
+                          path, size, n_buckets, depth + 1)
+            sub_paths, sub_sizes = _partition(_load_bucket(path), key_columns, n_buckets,
+                                              spill_dir, depth + 1)
+            os.remove(path)
+            yield from _distinct_buckets(sub_paths, sub_sizes, key_columns, columns, memory_budget,
+                                         spill_dir, depth + 1, dedupe)
+            continue
+        bucket = pd.concat(list(_load_bucket(path)), sort=False)
+        os.remove(path)
+        yield dedupe(bucket.reindex(columns=columns))
+
+def external_distinct(frames, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                      n_buckets: int = DEFAULT_BUCKETS, spill_dir: str = None,
+                      keys: list = None, keep: str = "first", order_by: str = None):
+    """
+    Remove duplicate rows from a stream of tables with bounded memory.
+    
+    Tables are buffered in memory until their combined size exceeds
+    memory_budget. Up to that point the result is identical to
+    Table.Distinct (first occurrence kept, input order preserved). Past it,
+    every row is hashed and appended to one of n_buckets spill files, and the
+    buckets are then de-duplicated one at a time. The output is then grouped
+    by bucket, keeping input order within each bucket, and every chunk has
+    the full union of input columns. A column should have the same dtype in
+    every table, as it does for read_folder's text tables.
+    
+    With keys, rows are partitioned by their key columns only, so all rows
+    of a key meet in one bucket and keep/order_by behave exactly as in
+    distinct_rows.
+    
+    Parameters:
+        frames (iterable): DataFrames to de-duplicate as one combined table.
+        memory_budget (int): Bytes of row data to hold in memory at once,
+            measured as loaded tables (not spill file sizes).
+        n_buckets (int): Number of on-disk partitions of the first spill pass;
+            a bucket too large to load is re-split into as many buckets as
+            its measured size needs.
+        spill_dir (str): Directory for spill files (default: system temp dir).
+        keys (list): Columns that identify a row (default: all columns).
+        keep (str): 'first' or 'last' row of each key to keep.
+        order_by (str): Column deciding which row is first or last.
+        
+    Yields:
+        pd.DataFrame: Chunks of the de-duplicated table.
+    """
+    if keep not in KEEP_OPTIONS:
+        raise ValueError(f"keep must be one of {KEEP_OPTIONS}, not {keep!r}")
+    dedupe = lambda table: distinct_rows(table, keys, keep, order_by)
+    frames = iter(frames)
+    buffered = []
+    buffered_bytes = 0
+    for df in frames:
+        buffered.append(df)
+        buffered_bytes += _frame_bytes(df)
+        if buffered_bytes > memory_budget:
+            break
+    else:
+        if buffered:
+            yield dedupe(combine_tables(buffered))
+        return
+    
+    logging.info(f"Distinct exceeded {memory_budget} bytes; spilling to {n_buckets} buckets")
+    columns = list(dict.fromkeys(col for df in buffered for col in df.columns))
+    
+    def all_frames():
+        yield from buffered
+        buffered.clear()  # release the buffered tables once they are spilled
+        yield from frames
+    
+    with tempfile.TemporaryDirectory(prefix="pquery-distinct-", dir=spill_dir) as tmp:
+        seen_columns = dict.fromkeys(columns)
+        key_columns = columns if keys is None else list(keys)
+        paths, sizes = _partition(all_frames(), key_columns, n_buckets, tmp, 0, seen_columns)
+        yield from _distinct_buckets(paths, sizes, key_columns if keys else list(seen_columns),
+                                     list(seen_columns), memory_budget, tmp, 0, dedupe)
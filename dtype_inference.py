@@ -0,0 +1,180 @@
+"""
+Compact dtype inference for ingested tables.
+
+The folder pipeline reads every value as text, and pd.read_csv defaults
+to int64/float64 and Python string objects, so a loaded portfolio uses far
+more memory than its data needs. This module profiles each table and
+merges the profiles into one dtype per column, then applies those dtypes
+to every table of a combine, so all parts agree before they are
+concatenated:
+
+- numeric columns get the smallest integer type that holds every value
+  (e.g. int8 for ages), nullable (pandas 'Int8', ...) when values are
+  missing; float32 is used for fractional columns only where the caller
+  allows it, since it keeps about 7 significant digits;
+- low-cardinality text columns become categoricals over the union of
+  every table's categories;
+- any other column is left as it is.
+
+A sample of each column decides which conversions are worth trying; a
+candidate is then checked against the whole column, so a value outside
+the sample can never be truncated or lost. Text only counts as a number
+when every value is written exactly the way its number prints back
+(str() of an int, repr() of a float), so the conversion is one-to-one and
+distinct texts such as '00123' and '123', or '1.50' and '1.5', stay
+distinct. A column mixing whole-number text ('1000') with decimal text is
+left as text for the same reason.
+"""
+import math
+import numpy as np
+import pandas as pd
+
+SAMPLE_ROWS = 10_000
+CATEGORY_MAX_UNIQUE = 1_000
+# A text column is categorical when its distinct values number at most
+# CATEGORY_MAX_UNIQUE and this fraction of its rows across all tables.
+CATEGORY_MAX_RATIO = 0.5
+INT_TYPES = (np.int8, np.int16, np.int32, np.int64)
+# Integers whose text survives the round trip through int ('-0' aside).
+INT_PATTERN = r"-?(?:0|[1-9][0-9]*)"
+
+# -----------------------------------------------------------------------------
+# Column Profiles
+# -----------------------------------------------------------------------------
+def profile_column(values: pd.Series, sample_rows: int = SAMPLE_ROWS) -> dict:
+    """
+    Profile one column for dtype inference.
+
+    Returns:
+        dict: {'kind': 'int', 'min', 'max', 'nulls'}, {'kind': 'float', 'nulls'},
+            {'kind': 'text', 'rows', 'categories'} or {'kind': 'other'}. Empty
+            text counts as a missing number, and numbers parsed from text
+            carry 'from_text': True; 'categories' is None when a text column
+            has too many distinct values to be categorical.
+    """
+    if pd.api.types.is_bool_dtype(values.dtype):
+        return {"kind": "other"}
+    if pd.api.types.is_integer_dtype(values.dtype):
+        present = values.dropna()
+        if present.empty:
+            return {"kind": "other"}
+        return {"kind": "int", "min": int(present.min()), "max": int(present.max()),
+                "nulls": len(present) < len(values)}
+    if pd.api.types.is_float_dtype(values.dtype):
+        return {"kind": "float", "nulls": bool(values.isna().any())}
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return {"kind": "text", "rows": len(values), "categories": list(values.cat.categories)}
+
+    present = values[values.notna() & (values != "")].astype(str)
+    sample = present.iloc[:sample_rows]
+    if len(sample) and _number_text_kind(sample) and _number_text_kind(present):
+        numbers = pd.to_numeric(present)
+        # Integers beyond int64 parse as object and stay text.
+        if pd.api.types.is_numeric_dtype(numbers.dtype):
+            profile = profile_column(numbers.reset_index(drop=True))
+            profile["nulls"] = len(present) < len(values)
+            profile["from_text"] = True
+            return profile
+    categories = None
+    if values.iloc[:sample_rows].nunique(dropna=True) <= CATEGORY_MAX_UNIQUE:
+        unique = values.dropna().unique()
+        if len(unique) <= CATEGORY_MAX_UNIQUE:
+            categories = list(unique)
+    return {"kind": "text", "rows": len(values), "categories": categories}
+
+def _number_text_kind(values: pd.Series):
+    """
+    Returns 'int' when every value is the str() of its int, 'float' when every
+    value is the repr() of a finite float, and None otherwise.
+    """
+    if values.str.fullmatch(INT_PATTERN).all() and not (values == "-0").any():
+        return "int"
+    for text in values.unique():
+        try:
+            number = float(text)
+        except ValueError:
+            return None
+        if not math.isfinite(number) or repr(number) != text:
+            return None
+    return "float"
+
+def profile_table(table: pd.DataFrame, sample_rows: int = SAMPLE_ROWS) -> dict:
+    """Returns a profile (see profile_column) for every column of a table."""
+    return {col: profile_column(table[col], sample_rows) for col in table.columns}
+
+def _int_dtype(low: int, high: int, nullable: bool):
+    for int_type in INT_TYPES:
+        info = np.iinfo(int_type)
+        if info.min <= low and high <= info.max:
+            return pd.api.types.pandas_dtype(int_type.__name__.capitalize()) if nullable else np.dtype(int_type)
+    return None  # beyond int64: leave the column alone
+
+def merge_profiles(profiles: list, float32=False) -> dict:
+    """
+    Merge per-table profiles into one dtype per column.
+
+    Parameters:
+        profiles (list): profile_table results, one per table.
+        float32 (bool or list): Allow float32 for every fractional column
+            (True) or for the listed columns.
+
+    Returns:
+        dict: Column name -> dtype, or None to leave the column unchanged.
+    """
+    columns = dict.fromkeys(col for profile in profiles for col in profile)
+    dtypes = {}
+    for col in columns:
+        parts = [profile[col] for profile in profiles if col in profile]
+        kinds = {part["kind"] for part in parts}
+        # A column some tables lack is null in their rows after the combine.
+        nulls = len(parts) < len(profiles) or any(part.get("nulls") for part in parts)
+        if kinds == {"int"}:
+            low = min(part["min"] for part in parts)
+            high = max(part["max"] for part in parts)
+            dtypes[col] = _int_dtype(low, high, nulls)
+        elif kinds == {"int", "float"} and any(part.get("from_text") for part in parts):
+            # Whole-number text ('1000') and float text ('1000.0') would merge.
+            dtypes[col] = None
+        elif kinds <= {"int", "float"}:
+            allowed = float32 is True or (float32 and col in float32)
+            dtypes[col] = np.dtype(np.float32 if allowed else np.float64)
+        elif kinds == {"text"} and all(part["categories"] is not None for part in parts):
+            categories = dict.fromkeys(value for part in parts for value in part["categories"])
+            rows = sum(part["rows"] for part in parts)
+            if len(categories) <= min(CATEGORY_MAX_UNIQUE, max(1, CATEGORY_MAX_RATIO * rows)):
+                dtypes[col] = pd.CategoricalDtype(sorted(categories, key=str))
+            else:
+                dtypes[col] = None
+        else:
+            dtypes[col] = None
+    return dtypes
+
+def infer_dtypes(tables: list, float32=False, sample_rows: int = SAMPLE_ROWS) -> dict:
+    """Infer one compact dtype per column that suits every table (see merge_profiles)."""
+    return merge_profiles([profile_table(table, sample_rows) for table in tables], float32)
+
+# -----------------------------------------------------------------------------
+# Applying Dtypes
+# -----------------------------------------------------------------------------
+def apply_dtypes(table: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+    """Convert a table's columns to inferred dtypes; columns mapped to None are kept."""
+    columns = {}
+    for col in table.columns:
+        dtype = dtypes.get(col)
+        values = table[col]
+        if dtype is None or values.dtype == dtype:
+            columns[col] = values
+        elif isinstance(dtype, pd.CategoricalDtype):
+            columns[col] = values.astype(dtype)
+        else:
+            if not pd.api.types.is_numeric_dtype(values.dtype):
+                # Parse nullable targets straight to nullable numbers: a detour
+                # through float64 would round integers beyond 2**53.
+                nullable = {} if isinstance(dtype, np.dtype) else {"dtype_backend": "numpy_nullable"}
+                values = pd.to_numeric(values.mask(values == ""), **nullable)
+            columns[col] = values.astype(dtype)
+    return pd.DataFrame(columns, index=table.index)
+
+def compact_dtypes(table: pd.DataFrame, float32=False) -> pd.DataFrame:
+    """Returns a table with every column converted to its most compact dtype."""
+    return apply_dtypes(table, infer_dtypes([table], float32))
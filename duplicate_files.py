@@ -0,0 +1,116 @@
+"""
+Byte-identical file elimination ahead of the folder parse.
+
+A feed that delivers the same extract twice under different names costs a
+full parse of the copy, and then Distinct time to drop its rows again.
+Identical files always produce identical rows, so whenever the pipeline
+ends in a full-row Distinct the copies can be skipped before parsing
+without changing the result.
+
+Files are compared cheaply first: only files that share a size can be
+identical, only those that also share a hash of their first block are
+hashed in full, and hashing runs on a thread pool (hashlib releases the
+GIL while it digests).
+"""
+import hashlib
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from manifest import content_hash
+from metrics import METRICS
+
+PREFIX_BYTES = 64 * 1024
+DEFAULT_HASH_WORKERS = 8
+
+def prefix_hash(path: str, size: int = PREFIX_BYTES) -> str:
+    """Returns the BLAKE2b hex digest of the first size bytes of a file."""
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(size), digest_size=16).hexdigest()
+
+def _refine(groups: list, key, pool) -> list:
+    """
+    Split candidate groups by key(path), keeping the groups that still collide.
+
+    Each group is split on its own, so files from different groups (e.g.
+    of different sizes) are never merged even when their digests agree.
+    """
+    paths = [path for group in groups for path in group]
+    digests = iter(pool.map(key, paths))
+    refined = []
+    for group in groups:
+        split = defaultdict(list)
+        for path in group:
+            split[next(digests)].append(path)
+        refined.extend(part for part in split.values() if len(part) > 1)
+    return refined
+
+def find_duplicate_files(paths: list, max_workers: int = DEFAULT_HASH_WORKERS) -> dict:
+    """
+    Find files whose contents are identical to an earlier file in the list.
+
+    Parameters:
+        paths (list): Files to compare, in priority order.
+        max_workers (int): Number of hashing threads.
+
+    Returns:
+        dict: Maps each duplicate path to the first path with the same contents.
+    """
+    by_size = defaultdict(list)
+    for path in paths:
+        by_size[os.path.getsize(path)].append(path)
+    groups = [group for group in by_size.values() if len(group) > 1]
+    if not groups:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hash") as pool:
+        groups = _refine(groups, prefix_hash, pool)
+        # Every file of a group has the same size; files no larger than the
+        # prefix are already fully compared.
+        small = [group for group in groups if os.path.getsize(group[0]) <= PREFIX_BYTES]
+        large = [group for group in groups if os.path.getsize(group[0]) > PREFIX_BYTES]
+        groups = small + (_refine(large, content_hash, pool) if large else [])
+
+    order = {path: i for i, path in enumerate(paths)}
+    duplicates = {}
+    for group in groups:
+        first, *copies = sorted(group, key=order.__getitem__)
+        duplicates.update(dict.fromkeys(copies, first))
+    return duplicates
+
+def unique_files(paths: list, max_workers: int = DEFAULT_HASH_WORKERS) -> list:
+    """Returns paths without the files that duplicate an earlier one, in order."""
+    with METRICS.stage("folder_dedupe_files", rows=len(paths)):
+        duplicates = find_duplicate_files(paths, max_workers)
+    if duplicates:
+        logging.info(f"Skipping {len(duplicates)} byte-identical duplicate files")
+    return [path for path in paths if path not in duplicates]
+
+def iter_unique_files(paths):
+    """
+    Streaming variant of unique_files for paths that arrive one by one.
+
+    A file is hashed only when an earlier file had the same size, so the
+    first file of every size passes straight through.
+    """
+    seen = {}  # size -> (first path of that size, set of content hashes or None)
+    skipped = 0
+    for path in paths:
+        size = os.path.getsize(path)
+        if size not in seen:
+            seen[size] = (path, None)
+            yield path
+            continue
+        first, hashes = seen[size]
+        if hashes is None:
+            hashes = {content_hash(first)}
+            seen[size] = (first, hashes)
+        digest = content_hash(path)
+        if digest in hashes:
+            skipped += 1
+            continue
+        hashes.add(digest)
+        yield path
+    if skipped:
+        logging.info(f"Skipped {skipped} byte-identical duplicate files")
@@ -0,0 +1,83 @@
+"""
+Headless pricing engine.
+
+Holds the premium model (calculate_premium_logic and its batch variants)
+on top of the shared rate table. It imports neither Qt, Tk nor pandas, and
+NumPy is only imported when a batch is first priced, so short-lived batch
+processes and workers can import it in a few milliseconds.
+"""
+import logging
+
+from metrics import METRICS
+from rate_table import RateTable, get_rate_table
+
+# -----------------------------------------------------------------------------
+# Actuarial Calculation Logic (Model)
+# -----------------------------------------------------------------------------
+def calculate_premium_logic(age: int, gender: str, coverage: float) -> float:
+    """
+    Calculate premium using simplified actuarial logic.
+    
+    Parameters:
+        age (int): Age of the applicant.
+        gender (str): Gender of the applicant ('male' or 'female').
+        coverage (float): Coverage amount.
+        
+    Returns:
+        float: Calculated premium.
+    """
+    with METRICS.stage("premium_scalar", rows=1):
+        rate = get_rate_table().rate(age, gender)
+        premium = coverage * rate
+    logging.debug("Computed premium: %s (Rate: %s)", premium, rate)
+    return premium
+
+def calculate_premium_batch(ages, genders=None, coverages=None) -> "np.ndarray":
+    """
+    Calculate premiums for many applicants in one vectorized pass.
+    
+    Gives exactly the same results as calculate_premium_logic applied row by row.
+    
+    Parameters:
+        ages (array-like or DataFrame): Ages of the applicants, or a DataFrame
+            with 'age', 'gender' and 'coverage' columns.
+        genders (array-like): Genders of the applicants ('male' or 'female').
+        coverages (array-like): Coverage amounts.
+        
+    Returns:
+        np.ndarray: Calculated premiums (float64), one per applicant.
+    """
+    if genders is None and coverages is None and hasattr(ages, "columns"):
+        ages, genders, coverages = ages["age"], ages["gender"], ages["coverage"]
+    with METRICS.stage("premium_batch") as timer:
+        premiums = get_rate_table().premiums(ages, genders, coverages)
+        timer.rows = premiums.size
+    logging.debug("Computed %d premiums in batch", premiums.size)
+    return premiums
+
+def calculate_premium_chunked(df, chunk_size: int = 1_000_000, progress=None,
+                              is_cancelled=None) -> "np.ndarray":
+    """
+    Calculate premiums for a DataFrame in chunks, reporting progress between chunks.
+    
+    Parameters:
+        df (DataFrame): Policies with 'age', 'gender' and 'coverage' columns.
+        chunk_size (int): Rows priced per chunk.
+        progress (callable): Called as progress(done, total) after each chunk.
+        is_cancelled (callable): Polled between chunks; returning True stops early.
+        
+    Returns:
+        np.ndarray: Calculated premiums, or None if cancelled.
+    """
+    import numpy as np
+    
+    total = len(df)
+    premiums = np.empty(total, dtype=np.float64)
+    for start in range(0, total, chunk_size):
+        if is_cancelled is not None and is_cancelled():
+            return None
+        chunk = df.iloc[start:start + chunk_size]
+        premiums[start:start + len(chunk)] = calculate_premium_batch(chunk)
+        if progress is not None:
+            progress(start + len(chunk), total)
+    return premiums
@@ -0,0 +1,217 @@
+"""
+Quote-free CSV reader for the read_folder.txt dialect.
+
+read_folder.txt parses with QuoteStyle.None, so a quote character is just
+data and a record always ends at the next line break. That lets a file be
+decoded in one call and split on delimiters and line breaks in bulk,
+without the per-character quote state the generic pandas parser keeps.
+When pyarrow is installed its multi-threaded CSV reader is used with
+quoting disabled; otherwise a NumPy block splitter is used. Files the
+fast path cannot represent exactly (ragged rows, duplicate headers, lone
+CR line breaks) fall back to pd.read_csv, so the result always matches
+parse_csv_file (see the pyarrow caveat below).
+
+The splitter only pays off on small files, where it avoids the fixed
+cost of a pd.read_csv call: about 15% faster at 1 MB and up to 40% on
+folders of ~50 KB extracts. On larger files creating the Python strings
+dominates both parsers and the C parser is as fast or faster, so files
+over SPLIT_MAX_BYTES, and column projections, go to pd.read_csv.
+
+Files with CR-only (classic Mac) line endings are read by pd.read_csv.
+A lone CR inside an otherwise LF-terminated file sends the splitter to
+pd.read_csv too, but pyarrow reads it itself; pd.read_csv breaks such
+lines inconsistently (e.g. when the CR is followed by a space), so with
+pyarrow the result may differ there.
+"""
+import csv
+import logging
+import os
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow is optional
+    pa = None
+
+DEFAULT_ENCODING = "cp1252"
+DEFAULT_DELIMITER = ","
+SNIFF_BYTES = 64 * 1024
+SPLIT_MAX_BYTES = 1 << 20  # larger files parse as fast with pd.read_csv
+CANDIDATE_DELIMITERS = ",;\t|"
+
+# -----------------------------------------------------------------------------
+# Dialect Detection
+# -----------------------------------------------------------------------------
+def detect_dialect(path: str, sample_bytes: int = SNIFF_BYTES) -> dict:
+    """
+    Detect the encoding, delimiter and quoting of a CSV file from a sample.
+    
+    The delimiter is the candidate that occurs in the header and the same
+    number of times on every complete sampled line. The encoding is UTF-8
+    when the sample decodes as UTF-8 and cp1252 otherwise.
+    
+    Returns:
+        dict: 'encoding', 'delimiter' and 'quoted' (True when the sample
+            contains double quotes, i.e. a quote-aware parser may be needed).
+    """
+    with open(path, "rb") as f:
+        sample = f.read(sample_bytes)
+    try:
+        # Drop a multi-byte character possibly cut off at the end of the sample.
+        sample.decode("utf-8") if len(sample) < sample_bytes else sample[:-3].decode("utf-8")
+        encoding = "utf-8"
+    except UnicodeDecodeError:
+        encoding = DEFAULT_ENCODING
+    lines = sample.decode(encoding, errors="replace").splitlines()
+    if len(sample) == sample_bytes:
+        lines = lines[:-1]  # the last sampled line may be incomplete
+    lines = [line for line in lines if line] or [""]
+    delimiter = DEFAULT_DELIMITER
+    best = 0
+    for candidate in CANDIDATE_DELIMITERS:
+        counts = {line.count(candidate) for line in lines}
+        if len(counts) == 1 and counts.pop() > best:
+            delimiter, best = candidate, lines[0].count(candidate)
+    return {"encoding": encoding, "delimiter": delimiter, "quoted": '"' in lines[0] or '"' in "".join(lines)}
+
+# -----------------------------------------------------------------------------
+# Quote-Free Readers
+# -----------------------------------------------------------------------------
+def _read_pandas(path: str, encoding: str, delimiter: str, usecols=None) -> pd.DataFrame:
+    """The generic parser, used when the fast path cannot be taken."""
+    if usecols is not None:
+        wanted = set(usecols)
+        usecols = lambda name: name in wanted
+    return pd.read_csv(
+        path,
+        sep=delimiter,
+        encoding=encoding,
+        quoting=csv.QUOTE_NONE,
+        dtype=str,
+        keep_default_na=False,
+        usecols=usecols,
+    )
+
+def _read_pyarrow(path: str, header: list, encoding: str, delimiter: str,
+                  usecols=None) -> pd.DataFrame:
+    if usecols is not None:
+        wanted = set(usecols)
+        header = [name for name in header if name in wanted]
+    table = pa_csv.read_csv(
+        path,
+        read_options=pa_csv.ReadOptions(encoding=encoding),
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter, quote_char=False),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in header},
+            include_columns=header,
+            strings_can_be_null=False,
+        ),
+    )
+    return table.to_pandas()
+
+def _decode_header(line: bytes, encoding: str, delimiter: str) -> list:
+    """Split the header line, dropping a UTF-8 byte order mark as pd.read_csv does."""
+    return line.decode(encoding).removeprefix("\ufeff").split(delimiter)
+
+def _split_block(data: bytes, encoding: str, delimiter: str):
+    """
+    Split a whole file into its header and a 2-D object array of fields.
+    
+    Line breaks and delimiters are located on the raw bytes with NumPy, which
+    is valid for cp1252, UTF-8 and other ASCII-compatible encodings, and the
+    text is decoded in one call. Returns None when the rows are ragged, so
+    the caller can fall back to the generic parser; so does a lone CR, which
+    pd.read_csv treats as a line break but not consistently (e.g. before a
+    space).
+    """
+    if b"\r" in data:
+        data = data.replace(b"\r\n", b"\n")
+        if b"\r" in data:
+            return None
+    while b"\n\n" in data:  # blank lines are skipped, as in pd.read_csv
+        data = data.replace(b"\n\n", b"\n")
+    data = data.strip(b"\n")
+    sep = delimiter.encode(encoding)
+    head, _, body = data.partition(b"\n")
+    header = _decode_header(head, encoding, delimiter)
+    width = len(header)
+    if not body:
+        return None
+    buf = np.frombuffer(body, dtype=np.uint8)
+    line_ends = np.append(np.flatnonzero(buf == ord("\n")), len(buf))
+    if width > 1:
+        seps = np.flatnonzero(buf == sep[0])
+        per_line = np.diff(np.searchsorted(seps, line_ends), prepend=0)
+        if np.any(per_line != width - 1):
+            return None
+        body = body.replace(b"\n", sep)
+    else:
+        # pd.read_csv still splits a single column on the delimiter, and
+        # skips lines holding only spaces and tabs.
+        if sep in body:
+            return None
+        filled = np.flatnonzero((buf != ord("\n")) & (buf != ord(" ")) & (buf != ord("\t")))
+        if np.any(np.diff(np.searchsorted(filled, line_ends), prepend=0) == 0):
+            return None
+    fields = body.decode(encoding).split(delimiter if width > 1 else "\n")
+    values = np.empty(len(fields), dtype=object)
+    values[:] = fields
+    return header, values.reshape(len(line_ends), width)
+
+def read_unquoted_csv(path: str, encoding: str = DEFAULT_ENCODING,
+                      delimiter: str = DEFAULT_DELIMITER, usecols=None) -> pd.DataFrame:
+    """
+    Parse a CSV file without quote handling, keeping every value as text.
+    
+    Produces the same table as pd.read_csv with quoting=csv.QUOTE_NONE,
+    dtype=str and keep_default_na=False (Csv.Document + Table.PromoteHeaders
+    with QuoteStyle.None), but decodes the file in bulk and splits it without
+    tracking quote state.
+    
+    Parameters:
+        path (str): CSV file to read.
+        encoding (str): Text encoding of the file (ASCII-compatible).
+        delimiter (str): Field delimiter (a single ASCII character).
+        usecols (list): Columns to keep (optional). Only these columns are
+            converted; names the file does not have are ignored. Without
+            pyarrow the projection is read with pd.read_csv.
+        
+    Returns:
+        pd.DataFrame: The parsed table, one text column per kept header field,
+            in file order.
+    """
+    if len(delimiter) != 1 or not delimiter.isascii() or delimiter in "\r\n":
+        return _read_pandas(path, encoding, delimiter, usecols)
+    with open(path, "rb") as f:
+        head = f.readline().removesuffix(b"\n").removesuffix(b"\r")
+        if b"\r" in head or not head.strip(b" \t"):
+            # CR-only line endings (which pd.read_csv splits on quirkily after
+            # the header), or a blank header line that pandas skips.
+            return _read_pandas(path, encoding, delimiter, usecols)
+        header = _decode_header(head, encoding, delimiter)
+        if len(set(header)) != len(header) or "" in header:
+            # Let pandas mangle duplicate names, name empty ones ('Unnamed: 2',
+            # e.g. from a trailing delimiter) and reject headerless files.
+            return _read_pandas(path, encoding, delimiter, usecols)
+        if pa is not None:
+            try:
+                return _read_pyarrow(path, header, encoding, delimiter, usecols)
+            except pa.ArrowInvalid as e:
+                logging.debug("pyarrow could not parse %s (%s); using pandas", path, e)
+                return _read_pandas(path, encoding, delimiter, usecols)
+        if usecols is not None or os.fstat(f.fileno()).st_size > SPLIT_MAX_BYTES:
+            # The block splitter would still split every field of every column,
+            # where the C parser's usecols skips the unwanted ones; and beyond
+            # SPLIT_MAX_BYTES creating the strings dominates and the C parser
+            # is as fast or faster.
+            return _read_pandas(path, encoding, delimiter, usecols)
+        f.seek(0)
+        split = _split_block(f.read(), encoding, delimiter)
+    if split is None:
+        # Ragged rows, or a header-only file: the generic parser handles both.
+        return _read_pandas(path, encoding, delimiter, usecols)
+    header, values = split
+    wanted = set(header if usecols is None else usecols)
+    return pd.DataFrame({name: values[:, i] for i, name in enumerate(header) if name in wanted})
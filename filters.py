@@ -0,0 +1,111 @@
+"""
+Row filters that can be pushed down into the per-file CSV reader.
+
+A filter is a (column, op, value) tuple, the Python spelling of a
+Table.SelectRows predicate such as `each [age] >= 30`. A list of filters
+is combined with AND. Columns are read as text; a filter with a numeric
+value compares the column numerically (text that is not a number never
+matches), and a filter with a string value compares the text as is.
+"""
+import operator
+import re
+import numpy as np
+import pandas as pd
+
+COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+FILTER_OPS = (*COMPARISONS, "in", "not in")
+_FILTER_PATTERN = re.compile(r"^\s*(.+?)\s*(==|!=|<>|<=|>=|<|>|=|\s+not\s+in\s+|\s+in\s+)\s*(.*?)\s*$")
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+
+def normalize_filters(filters) -> list:
+    """
+    Validate filters and return them as a list of (column, op, value) tuples.
+    
+    '=' and '<>' (the M spellings) are accepted as aliases of '==' and '!=';
+    'in' and 'not in' take a collection of values.
+    """
+    normalized = []
+    for item in filters or []:
+        try:
+            column, op, value = item
+        except (TypeError, ValueError):
+            raise ValueError(f"Filter must be a (column, op, value) tuple: {item!r}")
+        op = {"=": "==", "<>": "!="}.get(op, op)
+        if op not in FILTER_OPS:
+            raise ValueError(f"Unsupported filter operator {op!r} in {item!r}")
+        if op in ("in", "not in"):
+            if isinstance(value, str) or not hasattr(value, "__iter__"):
+                raise ValueError(f"Filter operator {op!r} needs a collection of values: {item!r}")
+            value = list(value)
+        normalized.append((column, op, value))
+    return normalized
+
+def filter_columns(filters) -> list:
+    """Returns the columns the filters read, in first-use order."""
+    return list(dict.fromkeys(column for column, _, _ in filters or []))
+
+def parse_filter(text: str) -> tuple:
+    """
+    Parse a filter written as text, e.g. 'age>=30' or 'gender in Male,Female'.
+    
+    Values that look like numbers become numbers, so they compare numerically.
+    """
+    match = _FILTER_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Cannot parse filter {text!r}")
+    column, op, value = match.groups()
+    op = " ".join(op.split())
+    
+    def convert(token):
+        for cast in (int, float):
+            try:
+                return cast(token)
+            except ValueError:
+                pass
+        return token
+    
+    if op in ("in", "not in"):
+        return column, op, [convert(token.strip()) for token in value.split(",")]
+    return column, op, convert(value)
+
+def filter_mask(table: pd.DataFrame, filters) -> np.ndarray:
+    """
+    Returns a boolean mask of the rows that satisfy every filter.
+    
+    A row never matches a filter on a column the table does not have.
+    """
+    mask = np.ones(len(table), dtype=bool)
+    for column, op, value in normalize_filters(filters):
+        if column not in table.columns:
+            return np.zeros(len(table), dtype=bool)
+        values = table[column]
+        if op in ("in", "not in"):
+            if value and all(_is_number(v) for v in value):
+                numbers = pd.to_numeric(values, errors="coerce")
+                hit = numbers.isin(value).to_numpy()
+                hit = ~hit & numbers.notna().to_numpy() if op == "not in" else hit
+            else:
+                hit = values.isin([str(v) for v in value]).to_numpy()
+                hit = ~hit if op == "not in" else hit
+        elif _is_number(value):
+            numbers = pd.to_numeric(values, errors="coerce")
+            hit = (COMPARISONS[op](numbers, value) & numbers.notna()).to_numpy()
+        else:
+            hit = COMPARISONS[op](values, value).to_numpy(dtype=bool, na_value=False)
+        mask &= hit
+    return mask
+
+def apply_filters(table: pd.DataFrame, filters) -> pd.DataFrame:
+    """Returns the rows of a table that satisfy every filter."""
+    if not filters:
+        return table
+    return table[filter_mask(table, filters)].reset_index(drop=True)
@@ -0,0 +1,88 @@
+"""
+Concurrent recursive folder scan (the Folder.Files source of read_folder.txt).
+
+Directories are listed with os.scandir on a thread pool, one task per
+directory, so the round trips of a network share overlap instead of adding
+up. The extension and glob filters run inside each task, and matching
+files are yielded as soon as their directory has been listed, so a
+consumer can start parsing before the scan finishes. Like os.walk,
+symlinked directories are not followed and unreadable directories are
+skipped.
+"""
+import fnmatch
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# os.scandir spends its time waiting on the file system with the GIL
+# released, so the pool can be much larger than the CPU count.
+DEFAULT_SCAN_WORKERS = 16
+
+def _matcher(ext: str = None, pattern: str = None):
+    """Returns a predicate on file names for an extension and a glob pattern."""
+    if ext is not None:
+        ext = ext.lower() if ext.startswith(".") else "." + ext.lower()
+
+    def match(name: str) -> bool:
+        if ext is not None and os.path.splitext(name)[1].lower() != ext:
+            return False
+        return pattern is None or fnmatch.fnmatch(name, pattern)
+    return match
+
+def _scan_dir(path: str, match) -> tuple:
+    """List one directory, returning its matching file entries and its subdirectories."""
+    files, dirs = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if not entry.is_symlink():
+                        dirs.append(entry.path)
+                elif match(entry.name):
+                    files.append(entry)
+    except OSError as e:
+        logging.debug("Skipping unreadable folder %s: %s", path, e)
+    return files, dirs
+
+def iter_folder_entries(folder_path: str, ext: str = None, pattern: str = None,
+                        max_workers: int = DEFAULT_SCAN_WORKERS):
+    """
+    Walk a folder tree concurrently, yielding matching files as they are found.
+
+    Parameters:
+        folder_path (str): Folder to scan.
+        ext (str): File extension to keep, e.g. '.csv' (default: all). Matching
+            ignores case.
+        pattern (str): Glob pattern the file name must match, e.g. 'extract_*'.
+        max_workers (int): Number of scanning threads.
+
+    Yields:
+        os.DirEntry: Matching files, in no particular order.
+    """
+    if not os.path.isdir(folder_path):
+        raise FileNotFoundError(f"Folder not found: {folder_path}")
+    match = _matcher(ext, pattern)
+    if max_workers <= 1:
+        stack = [folder_path]
+        while stack:
+            files, dirs = _scan_dir(stack.pop(), match)
+            stack.extend(dirs)
+            yield from files
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scan") as pool:
+        pending = {pool.submit(_scan_dir, folder_path, match)}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, dirs = future.result()
+                    pending.update(pool.submit(_scan_dir, path, match) for path in dirs)
+                    yield from files
+        finally:
+            for future in pending:  # the consumer stopped early
+                future.cancel()
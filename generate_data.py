@@ -0,0 +1,200 @@
+import argparse
+import logging
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# Generator Configuration
+# -----------------------------------------------------------------------------
+DEFAULT_CHUNK_ROWS = 1_000_000
+DEFAULT_ENCODING = "cp1252"  # matches the read_folder.txt dialect
+
+DEFAULT_SPEC = {
+    "age_dist": "uniform",        # 'uniform' or 'normal'
+    "age_min": 18,
+    "age_max": 85,
+    "age_mean": 45.0,
+    "age_sd": 15.0,
+    "male_share": 0.5,
+    "coverage_dist": "lognormal",  # 'lognormal' or 'uniform'
+    "coverage_min": 10_000.0,
+    "coverage_max": 1_000_000.0,
+    "coverage_median": 150_000.0,
+    "coverage_sigma": 0.8,
+    "dup_rate": 0.0,
+}
+
+# -----------------------------------------------------------------------------
+# Synthetic Portfolio Generation
+# -----------------------------------------------------------------------------
+def generate_portfolio(rows: int, seed=0, first_id: int = 0, **spec) -> pd.DataFrame:
+    """
+    Generate a synthetic portfolio of policies.
+    
+    Parameters:
+        rows (int): Number of policies.
+        seed (int or SeedSequence): Random seed.
+        first_id (int): policy_id of the first generated policy.
+        **spec: Overrides for DEFAULT_SPEC (age, gender and coverage
+            distributions and dup_rate, the fraction of rows that are exact
+            copies of other rows in the same portfolio).
+            
+    Returns:
+        pd.DataFrame: Columns policy_id, age, gender and coverage.
+    """
+    unknown = set(spec) - set(DEFAULT_SPEC)
+    if unknown:
+        raise ValueError(f"Unknown portfolio options: {', '.join(sorted(unknown))}")
+    spec = {**DEFAULT_SPEC, **spec}
+    if not 0.0 <= spec["dup_rate"] < 1.0:
+        raise ValueError("dup_rate must be in [0, 1).")
+    rng = np.random.default_rng(seed)
+    
+    if spec["age_dist"] == "uniform":
+        ages = rng.integers(spec["age_min"], spec["age_max"] + 1, rows)
+    elif spec["age_dist"] == "normal":
+        ages = np.rint(rng.normal(spec["age_mean"], spec["age_sd"], rows))
+        ages = np.clip(ages, spec["age_min"], spec["age_max"])
+    else:
+        raise ValueError(f"Unknown age distribution: {spec['age_dist']}")
+    
+    genders = np.where(rng.random(rows) < spec["male_share"], "Male", "Female")
+    
+    if spec["coverage_dist"] == "lognormal":
+        coverages = rng.lognormal(np.log(spec["coverage_median"]), spec["coverage_sigma"], rows)
+        coverages = np.clip(coverages, spec["coverage_min"], spec["coverage_max"])
+    elif spec["coverage_dist"] == "uniform":
+        coverages = rng.uniform(spec["coverage_min"], spec["coverage_max"], rows)
+    else:
+        raise ValueError(f"Unknown coverage distribution: {spec['coverage_dist']}")
+    
+    policy_ids = np.arange(first_id, first_id + rows, dtype=np.int64)
+    
+    # Replace a dup_rate share of rows with copies of the remaining rows.
+    n_dups = int(round(rows * spec["dup_rate"]))
+    if n_dups and rows > n_dups:
+        take = np.arange(rows)
+        targets = rng.choice(rows, n_dups, replace=False)
+        take[targets] = rng.choice(np.setdiff1d(take, targets), n_dups)
+        policy_ids, ages, genders, coverages = (
+            column[take] for column in (policy_ids, ages, genders, coverages)
+        )
+    
+    return pd.DataFrame({
+        "policy_id": policy_ids,
+        "age": ages.astype(np.int16),
+        "gender": genders,
+        "coverage": np.round(coverages, 2),
+    })
+
+def _write_chunk(path: str, rows: int, seed, first_id: int, header: bool, encoding: str, spec: dict) -> str:
+    df = generate_portfolio(rows, seed, first_id, **spec)
+    df.to_csv(path, header=header, index=False, encoding=encoding)
+    return path
+
+def _chunk_plan(rows: int, parts: int):
+    """Splits rows into parts near-equal (first_id, rows) ranges."""
+    bounds = np.linspace(0, rows, parts + 1).astype(np.int64)
+    return [(int(start), int(end - start)) for start, end in zip(bounds[:-1], bounds[1:])]
+
+def write_folder(folder: str, rows: int, files: int, seed: int = 0, workers: int = None,
+                 encoding: str = DEFAULT_ENCODING, **spec) -> list:
+    """
+    Write a portfolio as a folder of CSV files in the layout read_folder.txt expects.
+    
+    Files are generated and written in parallel, one file per task.
+    
+    Returns:
+        list: Paths of the written files.
+    """
+    os.makedirs(folder, exist_ok=True)
+    seeds = np.random.SeedSequence(seed).spawn(files)
+    width = max(5, len(str(files - 1)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_write_chunk, os.path.join(folder, f"extract_{i:0{width}d}.csv"),
+                        n, seeds[i], first_id, True, encoding, spec)
+            for i, (first_id, n) in enumerate(_chunk_plan(rows, files))
+        ]
+        return [future.result() for future in futures]
+
+def write_csv(path: str, rows: int, seed: int = 0, workers: int = None,
+              chunk_rows: int = DEFAULT_CHUNK_ROWS, encoding: str = DEFAULT_ENCODING, **spec) -> str:
+    """
+    Write a portfolio as a single CSV file.
+    
+    Chunks are generated and written to part files in parallel, then
+    appended to the output in order with a plain byte copy.
+    """
+    parts = max(1, -(-rows // chunk_rows))
+    seeds = np.random.SeedSequence(seed).spawn(parts)
+    part_dir = path + ".parts"
+    os.makedirs(part_dir, exist_ok=True)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_write_chunk, os.path.join(part_dir, f"{i:06d}.csv"),
+                            n, seeds[i], first_id, i == 0, encoding, spec)
+                for i, (first_id, n) in enumerate(_chunk_plan(rows, parts))
+            ]
+            with open(path, "wb") as out:
+                for future in futures:
+                    with open(future.result(), "rb") as part:
+                        shutil.copyfileobj(part, out, 1 << 20)
+                    os.remove(part.name)
+    finally:
+        shutil.rmtree(part_dir, ignore_errors=True)
+    return path
+
+# -----------------------------------------------------------------------------
+# Main Execution
+# -----------------------------------------------------------------------------
+def main(argv=None):
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Generate synthetic policy data for load testing")
+    parser.add_argument("rows", type=float, help="Number of policies (e.g. 1e8)")
+    parser.add_argument("output", help="Output CSV file, or folder with --files")
+    parser.add_argument("--files", type=int, default=None, help="Write a folder of this many CSV files")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Number of writer processes")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help="Rows per parallel chunk for single-file output")
+    parser.add_argument("--encoding", default=DEFAULT_ENCODING)
+    parser.add_argument("--dup-rate", type=float, default=DEFAULT_SPEC["dup_rate"],
+                        help="Fraction of rows that duplicate another row in the same chunk/file")
+    parser.add_argument("--age-dist", choices=["uniform", "normal"], default=DEFAULT_SPEC["age_dist"])
+    parser.add_argument("--age-min", type=int, default=DEFAULT_SPEC["age_min"])
+    parser.add_argument("--age-max", type=int, default=DEFAULT_SPEC["age_max"])
+    parser.add_argument("--age-mean", type=float, default=DEFAULT_SPEC["age_mean"])
+    parser.add_argument("--age-sd", type=float, default=DEFAULT_SPEC["age_sd"])
+    parser.add_argument("--male-share", type=float, default=DEFAULT_SPEC["male_share"])
+    parser.add_argument("--coverage-dist", choices=["lognormal", "uniform"], default=DEFAULT_SPEC["coverage_dist"])
+    parser.add_argument("--coverage-min", type=float, default=DEFAULT_SPEC["coverage_min"])
+    parser.add_argument("--coverage-max", type=float, default=DEFAULT_SPEC["coverage_max"])
+    parser.add_argument("--coverage-median", type=float, default=DEFAULT_SPEC["coverage_median"])
+    parser.add_argument("--coverage-sigma", type=float, default=DEFAULT_SPEC["coverage_sigma"])
+    args = parser.parse_args(argv)
+    
+    spec = {key: getattr(args, key) for key in DEFAULT_SPEC}
+    rows = int(args.rows)
+    try:
+        if args.files:
+            paths = write_folder(args.output, rows, args.files, args.seed, args.workers, args.encoding, **spec)
+            logging.info(f"Wrote {rows} policies to {len(paths)} files in {args.output}")
+        else:
+            write_csv(args.output, rows, args.seed, args.workers, args.chunk_rows, args.encoding, **spec)
+            logging.info(f"Wrote {rows} policies to {args.output}")
+    except (OSError, ValueError) as e:
+        logging.error(f"Data generation failed: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,14 @@
+import io
 from gooey import Gooey, GooeyParser
 import pandas as pd
 import tkinter as tk
 from tkinter import ttk
 
+from column_cache import read_csv_cached
+from dtype_inference import compact_dtypes
+
+PREVIEW_ROWS = 5
+
 # GUI decorator
 @Gooey(program_name="CSV Importer", required_cols=1, default_size=(600, 400))
 def main():
@@ -13,17 +19,73 @@ def main():
         widget="FileChooser",
         type=str
     )
+    parser.add_argument(
+        "--rows",
+        help="Number of rows to preview",
+        widget="IntegerField",
+        type=int,
+        default=PREVIEW_ROWS
+    )
+    parser.add_argument(
+        "--sample-offset",
+        help="Preview rows starting near this byte offset instead of the top of the file",
+        type=int,
+        default=None
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Import the whole file through a columnar cache; re-opens memory-map it",
+        widget="DirChooser",
+        type=str,
+        default=None
+    )
+    parser.add_argument(
+        "--compact-dtypes",
+        help="Store columns in the smallest dtypes that hold them (categoricals, int8/int16, ...)",
+        widget="CheckBox",
+        action="store_true"
+    )
     
     args = parser.parse_args()
     
     if args.csv_file:
         try:
-            df = pd.read_csv(args.csv_file)
-            display_csv(df)
+            if args.cache_dir:
+                df = read_csv_cached(args.csv_file, args.cache_dir)
+            else:
+                df = read_preview(args.csv_file, args.rows, args.sample_offset)
+            if args.compact_dtypes:
+                df = compact_dtypes(df)
+            display_csv(df, args.rows)
         except Exception as e:
             print(f"Error reading CSV file: {e}")
 
-def display_csv(df):
+def read_preview(csv_file, rows=PREVIEW_ROWS, offset=None):
+    """
+    Read only the header and a few rows of a CSV file.
+    
+    Without an offset the first rows are read; with one, the file is seeked to
+    that byte position and the rows following the next line break are read,
+    giving a cheap sample from anywhere in a large file. Either way only a few
+    lines are read, whatever the size of the file.
+    """
+    if offset is None:
+        return pd.read_csv(csv_file, nrows=rows)
+    
+    with open(csv_file, "rb") as f:
+        header = f.readline()
+        if offset > f.tell():
+            f.seek(offset - 1)
+            f.readline()  # skip to the start of the next full line
+        lines = [header]
+        for _ in range(rows):
+            line = f.readline()
+            if not line:
+                break
+            lines.append(line)
+    return pd.read_csv(io.BytesIO(b"".join(lines)))
+
+def display_csv(df, rows=PREVIEW_ROWS):
     """ Display CSV contents in a simple Tkinter window """
     root = tk.Tk()
     root.title("CSV Preview")
@@ -37,8 +99,8 @@ def display_csv(df):
         tree.heading(col, text=col)
         tree.column(col, width=100)
     
-    for _, row in df.head(5).iterrows():
-        tree.insert("", "end", values=list(row))
+    for values in df.head(rows).itertuples(index=False, name=None):
+        tree.insert("", "end", values=values)
     
     tree.pack(fill="both", expand=True)
     
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import logging
+import os
+import pandas as pd
+
+from column_cache import ColumnCache
+
+# -----------------------------------------------------------------------------
+# Manifest Configuration
+# -----------------------------------------------------------------------------
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 3
+HASH_BLOCK_SIZE = 1 << 20
+
+# -----------------------------------------------------------------------------
+# File Fingerprints
+# -----------------------------------------------------------------------------
+def content_hash(path: str) -> str:
+    """Returns the BLAKE2b hex digest of a file's contents."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def file_fingerprint(path: str) -> dict:
+    """Returns the size, modification time and content hash of a file."""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": content_hash(path)}
+
+# -----------------------------------------------------------------------------
+# File Manifest Cache
+# -----------------------------------------------------------------------------
+class FileManifest:
+    """
+    FileManifest records the fingerprint of every ingested file along with a
+    cached copy of its parsed table, so unchanged files are never parsed twice.
+    
+    A file is unchanged when its size and modification time match the
+    manifest. When only the modification time differs, the content hash is
+    checked before the file is treated as modified. Cached tables are stored
+    in a ColumnCache under their content hash and the parse options, so
+    identical files share one entry, a table parsed with other options is
+    never reused, and reloading a table memory-maps its columns.
+    """
+    def __init__(self, cache_dir: str, options: dict = None):
+        """
+        Parameters:
+            cache_dir (str): Directory holding the manifest and cached tables.
+            options (dict): Parse options the cached tables depend on; the
+                cache is discarded when they change.
+        """
+        self.cache_dir = cache_dir
+        self.options = options or {}
+        options_json = json.dumps(self.options, sort_keys=True, default=str)
+        self.options_key = hashlib.blake2b(options_json.encode("utf-8"), digest_size=8).hexdigest()
+        self.entries = {}
+        self.tables = ColumnCache(cache_dir)
+        self._load()
+    
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.cache_dir, MANIFEST_NAME)
+    
+    def table_key(self, digest: str) -> str:
+        """Returns the cache key of a table from its file's content hash and the parse options."""
+        return f"{digest}-{self.options_key}"
+    
+    def _load(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            logging.warning(f"Ignoring unreadable manifest {self.manifest_path}")
+            return
+        if data.get("version") != MANIFEST_VERSION or data.get("options") != self.options:
+            logging.info("Manifest was built with different options; re-parsing all files")
+            return
+        self.entries = data.get("files", {})
+    
+    def is_current(self, path: str) -> bool:
+        """Returns True when the file is unchanged since its table was cached."""
+        entry = self.entries.get(os.path.abspath(path))
+        if entry is None:
+            return False
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if st.st_size != entry["size"]:
+            return False
+        if st.st_mtime_ns != entry["mtime_ns"]:
+            # Touched but possibly unchanged: fall back to the content hash.
+            if content_hash(path) != entry["hash"]:
+                return False
+            entry["mtime_ns"] = st.st_mtime_ns
+        return self.table_key(entry["hash"]) in self.tables
+    
+    def load(self, path: str) -> pd.DataFrame:
+        """Returns the cached table of a file recorded in the manifest."""
+        return self.tables.read(self.table_key(self.entries[os.path.abspath(path)]["hash"]))
+    
+    def put(self, path: str, fingerprint: dict, table: pd.DataFrame):
+        """Records a freshly parsed file and caches its table."""
+        key = self.table_key(fingerprint["hash"])
+        if key not in self.tables:
+            self.tables.write(key, table)
+        self.entries[os.path.abspath(path)] = dict(fingerprint)
+    
+    def prune(self, paths: list):
+        """Forgets files that are no longer present and deletes unreferenced tables."""
+        keep = {os.path.abspath(path) for path in paths}
+        self.entries = {path: entry for path, entry in self.entries.items() if path in keep}
+        referenced = {self.table_key(entry["hash"]) for entry in self.entries.values()}
+        for key in self.tables.keys():
+            if key not in referenced:
+                self.tables.remove(key)
+    
+    def save(self):
+        """Writes the manifest atomically."""
+        data = {"version": MANIFEST_VERSION, "options": self.options, "files": self.entries}
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.manifest_path)
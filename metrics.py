@@ -0,0 +1,215 @@
+import json
+import os
+import threading
+import time
+
+# -----------------------------------------------------------------------------
+# Metrics Configuration
+# -----------------------------------------------------------------------------
+METRIC_PREFIX = "pquery"
+
+# Latency histogram bucket upper bounds in seconds (1 µs .. ~100 s, x4 steps).
+LATENCY_BUCKETS = tuple(1e-6 * 4 ** i for i in range(14))
+
+# -----------------------------------------------------------------------------
+# Stage Statistics
+# -----------------------------------------------------------------------------
+class StageStats:
+    """
+    StageStats accumulates calls, rows processed and a latency histogram for
+    one named stage (e.g. 'premium_batch' or 'folder_parse').
+    """
+    def __init__(self, name: str, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.calls = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+    
+    def observe(self, seconds: float, rows: int = 0):
+        slot = 0
+        for bound in self.buckets:
+            if seconds <= bound:
+                break
+            slot += 1
+        with self._lock:
+            self.calls += 1
+            self.rows += rows
+            self.seconds += seconds
+            self.bucket_counts[slot] += 1
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "rows": self.rows,
+                "seconds": self.seconds,
+                "rows_per_second": self.rows / self.seconds if self.seconds > 0 else 0.0,
+                "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.bucket_counts)),
+            }
+
+class _StageTimer:
+    """Context manager that times a block and records it on a StageStats."""
+    __slots__ = ("stats", "rows", "start")
+    
+    def __init__(self, stats: StageStats, rows: int):
+        self.stats = stats
+        self.rows = rows
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stats.observe(time.perf_counter() - self.start, self.rows)
+        return False
+
+class _NullTimer:
+    """Shared do-nothing timer handed out while metrics are disabled."""
+    __slots__ = ("rows",)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+# -----------------------------------------------------------------------------
+# Metrics Registry
+# -----------------------------------------------------------------------------
+class MetricsRegistry:
+    """
+    MetricsRegistry holds the StageStats of every instrumented stage.
+    
+    While disabled, stage() returns a shared no-op context manager, so
+    instrumented code pays one attribute check per call and nothing else.
+    Worker processes keep their own registries; stages timed in the parent
+    process (such as a whole folder parse) cover their work.
+    """
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages = {}
+        self._lock = threading.Lock()
+    
+    def stats(self, name: str) -> StageStats:
+        """Returns the StageStats for a stage, creating it on first use."""
+        stats = self.stages.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self.stages.setdefault(name, StageStats(name))
+        return stats
+    
+    def stage(self, name: str, rows: int = 0):
+        """
+        Returns a context manager timing one execution of a stage.
+        
+        The rows processed can be passed up front or set on the returned
+        timer (timer.rows = n) before the block ends.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self.stats(name), rows)
+    
+    def timed_iter(self, iterable, name: str, rows=len):
+        """
+        Wraps an iterator so the wait for each item is recorded as one
+        execution of a stage, counting rows(item) rows. Returns the iterable
+        unchanged while metrics are disabled.
+        """
+        if not self.enabled:
+            return iterable
+        return self._timed_iter(iter(iterable), self.stats(name), rows)
+    
+    @staticmethod
+    def _timed_iter(iterator, stats: StageStats, rows):
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                stats.observe(time.perf_counter() - start, rows(item))
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+    
+    def record(self, name: str, seconds: float, rows: int = 0):
+        """Records an already-measured execution of a stage."""
+        if self.enabled:
+            self.stats(name).observe(seconds, rows)
+    
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+    
+    def snapshot(self) -> dict:
+        """Returns all stage statistics as a JSON-serializable dict."""
+        return {
+            "timestamp": time.time(),
+            "stages": {name: stats.snapshot() for name, stats in sorted(self.stages.items())},
+        }
+    
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+    
+    def to_prometheus(self) -> str:
+        """Renders the statistics in the Prometheus text exposition format."""
+        p = METRIC_PREFIX
+        lines = [
+            f"# HELP {p}_stage_calls_total Executions of each stage.",
+            f"# TYPE {p}_stage_calls_total counter",
+        ]
+        snapshots = self.snapshot()["stages"]
+        for name, snap in snapshots.items():
+            lines.append(f'{p}_stage_calls_total{{stage="{name}"}} {snap["calls"]}')
+        lines += [
+            f"# HELP {p}_stage_rows_total Rows processed by each stage.",
+            f"# TYPE {p}_stage_rows_total counter",
+        ]
+        for name, snap in snapshots.items():
+            lines.append(f'{p}_stage_rows_total{{stage="{name}"}} {snap["rows"]}')
+        lines += [
+            f"# HELP {p}_stage_rows_per_second Average throughput of each stage.",
+            f"# TYPE {p}_stage_rows_per_second gauge",
+        ]
+        for name, snap in snapshots.items():
+            lines.append(f'{p}_stage_rows_per_second{{stage="{name}"}} {snap["rows_per_second"]!r}')
+        lines += [
+            f"# HELP {p}_stage_duration_seconds Latency of each stage.",
+            f"# TYPE {p}_stage_duration_seconds histogram",
+        ]
+        for name, snap in snapshots.items():
+            cumulative = 0
+            for bound, count in snap["buckets"].items():
+                cumulative += count
+                lines.append(f'{p}_stage_duration_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{p}_stage_duration_seconds_sum{{stage="{name}"}} {snap["seconds"]!r}')
+            lines.append(f'{p}_stage_duration_seconds_count{{stage="{name}"}} {snap["calls"]}')
+        return "\n".join(lines) + "\n"
+    
+    def write(self, path: str):
+        """Writes a snapshot to path: Prometheus text for '.prom' files, JSON otherwise."""
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+# -----------------------------------------------------------------------------
+# Shared Default Registry
+# -----------------------------------------------------------------------------
+# Set PQUERY_METRICS=1 to collect metrics from process start.
+METRICS = MetricsRegistry(enabled=os.environ.get("PQUERY_METRICS", "") not in ("", "0"))
+
+def enable():
+    METRICS.enabled = True
+
+def disable():
+    METRICS.enabled = False
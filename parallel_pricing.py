@@ -0,0 +1,111 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+from engine import calculate_premium_batch, get_rate_table
+
+# -----------------------------------------------------------------------------
+# Parallel Pricing Configuration
+# -----------------------------------------------------------------------------
+DEFAULT_SHARD_ROWS = 1_000_000
+# Below this many rows the pool start-up costs more than it saves.
+MIN_PARALLEL_ROWS = 2_000_000
+
+# -----------------------------------------------------------------------------
+# Worker Side
+# -----------------------------------------------------------------------------
+_worker_state = {}
+
+def _attach(name: str, dtype: str, rows: int):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray((rows,), dtype=np.dtype(dtype), buffer=shm.buf)
+
+def _init_worker(specs: dict, rows: int, rates):
+    """Attaches the shared column buffers once per worker process."""
+    for key, (name, dtype) in specs.items():
+        _worker_state[key] = _attach(name, dtype, rows)
+    _worker_state["rates"] = rates
+
+def _price_shard(start: int, end: int) -> int:
+    """Prices rows [start, end) straight from and into shared memory."""
+    ages = _worker_state["ages"][1]
+    codes = _worker_state["codes"][1]
+    coverages = _worker_state["coverages"][1]
+    out = _worker_state["out"][1]
+    rates = _worker_state["rates"].rates_for(ages[start:end], codes[start:end])
+    np.multiply(coverages[start:end], rates, out=out[start:end])
+    return end - start
+
+# -----------------------------------------------------------------------------
+# Parallel Batch Pricing
+# -----------------------------------------------------------------------------
+def _to_shared(values: np.ndarray, blocks: list):
+    shm = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+    blocks.append(shm)
+    shared = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)
+    shared[...] = values
+    return shm.name, shared
+
+def calculate_premium_parallel(ages, genders=None, coverages=None, workers: int = None,
+                               shard_rows: int = DEFAULT_SHARD_ROWS, rates=None) -> np.ndarray:
+    """
+    Calculate premiums on all cores using shared-memory column buffers.
+    
+    The age, gender-code and coverage columns are copied once into
+    multiprocessing.shared_memory blocks, and row ranges are sharded across
+    a process pool. Each worker reads its rows from the shared inputs and
+    writes premiums into a shared output buffer, so no row data is pickled.
+    Results are identical to calculate_premium_batch.
+    
+    Parameters:
+        ages (array-like or DataFrame): Ages, or a DataFrame with 'age',
+            'gender' and 'coverage' columns.
+        genders (array-like): Genders (labels or rate-table codes).
+        coverages (array-like): Coverage amounts.
+        workers (int): Number of worker processes (default: CPU count).
+        shard_rows (int): Rows priced per task.
+        rates (RateTable): Rate table to use (default: the shared table).
+        
+    Returns:
+        np.ndarray: Calculated premiums (float64), one per applicant.
+    """
+    if genders is None and coverages is None and hasattr(ages, "columns"):
+        ages, genders, coverages = ages["age"], ages["gender"], ages["coverage"]
+    rates = rates or get_rate_table()
+    workers = workers or os.cpu_count() or 1
+    ages = np.asarray(ages)
+    rows = len(ages)
+    if workers == 1 or rows < min(MIN_PARALLEL_ROWS, 2 * shard_rows):
+        if rates is get_rate_table():
+            return calculate_premium_batch(ages, genders, coverages)
+        return rates.premiums(ages, genders, coverages)
+    
+    codes = rates.encode_genders(genders)
+    codes = codes.astype(np.int8 if len(rates.genders) < 128 else np.intp)
+    coverages = np.asarray(coverages, dtype=np.float64)
+    if not len(codes) == len(coverages) == rows:
+        raise ValueError("ages, genders and coverages must have the same length.")
+    
+    blocks = []
+    out = None
+    try:
+        specs = {}
+        for key, values in (("ages", ages), ("codes", codes), ("coverages", coverages)):
+            specs[key] = (_to_shared(values, blocks)[0], values.dtype.str)
+        out_name, out = _to_shared(np.empty(rows, dtype=np.float64), blocks)
+        specs["out"] = (out_name, out.dtype.str)
+        
+        starts = range(0, rows, shard_rows)
+        ends = [min(start + shard_rows, rows) for start in starts]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(specs, rows, rates)) as pool:
+            priced = sum(pool.map(_price_shard, starts, ends))
+        if priced != rows:
+            raise RuntimeError(f"Priced {priced} of {rows} rows.")
+        return out.copy()
+    finally:
+        del out  # release the view before closing its buffer
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,201 @@
+import argparse
+import logging
+import struct
+import sys
+import numpy as np
+
+from engine import calculate_premium_batch, get_rate_table
+
+# -----------------------------------------------------------------------------
+# Binary Policy File Format
+# -----------------------------------------------------------------------------
+# Layout (little-endian):
+#   magic        8s   b"PQPOLICY"
+#   version      u2   FORMAT_VERSION
+#   header_size  u2   bytes before the first record (multiple of 16)
+#   record_size  u4   POLICY_DTYPE.itemsize, checked on open
+#   count        u8   number of records
+#   labels       ... comma-separated gender labels; record gender codes index them
+#   records      count x POLICY_DTYPE
+MAGIC = b"PQPOLICY"
+FORMAT_VERSION = 1
+PREFIX = struct.Struct("<8sHHIQ")
+POLICY_DTYPE = np.dtype([("age", "<i2"), ("gender", "u1"), ("coverage", "<f8")])
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+class PolicyFile:
+    """
+    PolicyFile is an open binary policy file whose records are memory-mapped.
+    
+    Attributes:
+        records (np.memmap): Structured array of POLICY_DTYPE records.
+        genders (list): Gender labels; a record's gender field indexes this list.
+    """
+    def __init__(self, path: str, mode: str = "r"):
+        with open(path, "rb") as f:
+            prefix = f.read(PREFIX.size)
+            if len(prefix) < PREFIX.size or prefix[:8] != MAGIC:
+                raise ValueError(f"{path} is not a policy file.")
+            _, version, header_size, record_size, count = PREFIX.unpack(prefix)
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported policy file version {version} in {path}.")
+            if record_size != POLICY_DTYPE.itemsize:
+                raise ValueError(f"Unexpected record size {record_size} in {path}.")
+            labels = f.read(header_size - PREFIX.size).rstrip(b"\0").decode("ascii")
+        self.path = path
+        self.genders = labels.split(",") if labels else []
+        self.records = np.memmap(path, dtype=POLICY_DTYPE, mode=mode, offset=header_size, shape=(count,))
+    
+    def __len__(self) -> int:
+        return len(self.records)
+
+def _header(genders: list, count: int) -> bytes:
+    labels = ",".join(genders).encode("ascii")
+    header_size = -(-(PREFIX.size + len(labels)) // 16) * 16
+    prefix = PREFIX.pack(MAGIC, FORMAT_VERSION, header_size, POLICY_DTYPE.itemsize, count)
+    return (prefix + labels).ljust(header_size, b"\0")
+
+def _to_records(ages, genders, coverages, rates) -> np.ndarray:
+    ages = np.asarray(ages)
+    if np.issubdtype(ages.dtype, np.floating):
+        if not np.all(np.isfinite(ages)) or np.any(ages != np.round(ages)):
+            raise ValueError("Ages must be whole numbers to be stored in a policy file.")
+    if ages.size and (ages.min() < np.iinfo(np.int16).min or ages.max() > np.iinfo(np.int16).max):
+        raise ValueError("Ages are out of range for a policy file.")
+    records = np.empty(len(ages), dtype=POLICY_DTYPE)
+    records["age"] = ages
+    records["gender"] = rates.encode_genders(genders)
+    records["coverage"] = coverages
+    return records
+
+def write_policy_file(path: str, ages, genders, coverages, rates=None) -> int:
+    """
+    Write policies to a binary policy file, encoding genders with a rate table.
+    
+    Returns:
+        int: Number of records written.
+    """
+    rates = rates or get_rate_table()
+    records = _to_records(ages, genders, coverages, rates)
+    with open(path, "wb") as f:
+        f.write(_header(rates.genders, len(records)))
+        records.tofile(f)
+    return len(records)
+
+def open_policy_file(path: str, mode: str = "r") -> PolicyFile:
+    """Opens a binary policy file, memory-mapping its records."""
+    return PolicyFile(path, mode)
+
+# -----------------------------------------------------------------------------
+# CSV Conversion
+# -----------------------------------------------------------------------------
+def csv_to_policy_file(csv_path: str, path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                       rates=None) -> int:
+    """Converts a policy CSV (age, gender, coverage columns) in streaming chunks."""
+    import pandas as pd
+    
+    rates = rates or get_rate_table()
+    count = 0
+    with open(path, "wb") as f:
+        f.write(_header(rates.genders, 0))
+        reader = pd.read_csv(
+            csv_path, usecols=["age", "gender", "coverage"], chunksize=chunk_rows,
+            dtype={"gender": "category"}, float_precision="round_trip",
+        )
+        with reader:
+            for chunk in reader:
+                _to_records(chunk["age"], chunk["gender"], chunk["coverage"], rates).tofile(f)
+                count += len(chunk)
+        f.seek(0)
+        f.write(_header(rates.genders, count))  # patch in the final record count
+    return count
+
+def policy_file_to_csv(path: str, csv_path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+    """Writes a binary policy file back out as CSV, chunk by chunk."""
+    import pandas as pd
+    
+    policies = open_policy_file(path)
+    labels = np.array(policies.genders, dtype=object)
+    with open(csv_path, "w", newline="") as out:
+        for start in range(0, len(policies), chunk_rows):
+            chunk = policies.records[start:start + chunk_rows]
+            pd.DataFrame({
+                "age": chunk["age"],
+                "gender": labels[chunk["gender"]],
+                "coverage": chunk["coverage"],
+            }).to_csv(out, header=(start == 0), index=False)
+        if len(policies) == 0:
+            out.write("age,gender,coverage\n")
+    return len(policies)
+
+# -----------------------------------------------------------------------------
+# Pricing on Memory-Mapped Records
+# -----------------------------------------------------------------------------
+def price_policy_file(path: str, out_path: str = None, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> np.ndarray:
+    """
+    Price every record of a binary policy file straight from its memory map.
+    
+    Records are priced chunk by chunk, so only the pages being priced are
+    resident. With out_path, premiums are written to a memory-mapped .npy
+    file instead of an in-memory array.
+    
+    Returns:
+        np.ndarray: Premiums (a memmap when out_path is given).
+    """
+    rates = get_rate_table()
+    policies = open_policy_file(path)
+    # Translate the file's gender codes to the current rate table's codes.
+    remap = np.array([rates.gender_code(label) for label in policies.genders] or [0], dtype=np.intp)
+    if out_path:
+        premiums = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.float64, shape=(len(policies),))
+    else:
+        premiums = np.empty(len(policies), dtype=np.float64)
+    for start in range(0, len(policies), chunk_rows):
+        chunk = policies.records[start:start + chunk_rows]
+        premiums[start:start + len(chunk)] = calculate_premium_batch(
+            chunk["age"], remap[chunk["gender"]], chunk["coverage"]
+        )
+    if out_path:
+        premiums.flush()
+    return premiums
+
+# -----------------------------------------------------------------------------
+# Main Execution
+# -----------------------------------------------------------------------------
+def main(argv=None):
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Convert and price binary policy files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    to_binary = commands.add_parser("to-binary", help="Convert a policy CSV to a binary policy file")
+    to_binary.add_argument("csv_file")
+    to_binary.add_argument("policy_file")
+    to_csv = commands.add_parser("to-csv", help="Convert a binary policy file to CSV")
+    to_csv.add_argument("policy_file")
+    to_csv.add_argument("csv_file")
+    price = commands.add_parser("price", help="Price a binary policy file into a .npy premium file")
+    price.add_argument("policy_file")
+    price.add_argument("premium_file")
+    for command in (to_binary, to_csv, price):
+        command.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args(argv)
+    
+    try:
+        if args.command == "to-binary":
+            count = csv_to_policy_file(args.csv_file, args.policy_file, args.chunk_rows)
+            logging.info(f"Wrote {count} policies to {args.policy_file}")
+        elif args.command == "to-csv":
+            count = policy_file_to_csv(args.policy_file, args.csv_file, args.chunk_rows)
+            logging.info(f"Wrote {count} policies to {args.csv_file}")
+        else:
+            premiums = price_policy_file(args.policy_file, args.premium_file, args.chunk_rows)
+            logging.info(f"Wrote {len(premiums)} premiums to {args.premium_file}")
+    except (OSError, ValueError) as e:
+        logging.error(f"Policy file command failed: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+import argparse
+import asyncio
+import json
+import logging
+import math
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from engine import calculate_premium_batch, calculate_premium_logic
+from metrics import METRICS
+
+# -----------------------------------------------------------------------------
+# Service Configuration
+# -----------------------------------------------------------------------------
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+MAX_BODY_BYTES = 64 << 20
+KEEP_ALIVE_TIMEOUT = 30.0
+# Batch bodies up to this size (a few dozen applicants) are priced on the
+# event loop: pricing them takes less time than the hand-off to the executor.
+INLINE_MAX_BYTES = 2048
+
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+# -----------------------------------------------------------------------------
+# Request Handlers
+# -----------------------------------------------------------------------------
+def _applicant_fields(applicant: dict):
+    try:
+        age, gender, coverage = float(applicant["age"]), str(applicant["gender"]), float(applicant["coverage"])
+    except KeyError as e:
+        raise ValueError(f"Missing field: {e.args[0]}") from None
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("age and coverage must be numbers.") from None
+    if not (math.isfinite(age) and math.isfinite(coverage)):
+        raise ValueError("age and coverage must be finite numbers.")
+    return age, gender, coverage
+
+def _number_column(values, name: str) -> np.ndarray:
+    """Returns a batch column as finite float64 numbers, the same coercion as _applicant_fields."""
+    if not isinstance(values, list):
+        raise ValueError(f"{name} must be a list.")
+    try:
+        column = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{name} must be numbers.") from None
+    if column.ndim != 1:
+        raise ValueError(f"{name} must be a flat list of numbers.")
+    if not np.isfinite(column).all():
+        raise ValueError(f"{name} must be finite numbers.")
+    return column
+
+def price_quote(body: bytes) -> dict:
+    """Prices one applicant: {"age": .., "gender": .., "coverage": ..}."""
+    applicant = json.loads(body)
+    if not isinstance(applicant, dict):
+        raise ValueError("Expected a JSON object.")
+    return {"premium": calculate_premium_logic(*_applicant_fields(applicant))}
+
+def price_batch(body: bytes) -> dict:
+    """
+    Prices many applicants in one vectorized pass.
+    
+    Accepts either {"applicants": [{"age": .., "gender": .., "coverage": ..}, ...]}
+    or the columnar form {"ages": [..], "genders": [..], "coverages": [..]}.
+    Both forms coerce ages and coverages to finite floats the same way, so an
+    applicant gets the same premium whichever form is used.
+    """
+    request = json.loads(body)
+    if not isinstance(request, dict):
+        raise ValueError("Expected a JSON object.")
+    if "applicants" in request:
+        applicants = request["applicants"]
+        if not isinstance(applicants, list):
+            raise ValueError("applicants must be a list.")
+        fields = [_applicant_fields(applicant) for applicant in applicants]
+        ages, genders, coverages = (list(column) for column in zip(*fields)) if fields else ([], [], [])
+    else:
+        try:
+            ages, genders, coverages = request["ages"], request["genders"], request["coverages"]
+        except KeyError as e:
+            raise ValueError(f"Missing field: {e.args[0]}") from None
+        if not isinstance(genders, list):
+            raise ValueError("genders must be a list.")
+        genders = [str(gender) for gender in genders]
+    ages = _number_column(ages, "ages")
+    coverages = _number_column(coverages, "coverages")
+    if not len(ages) == len(genders) == len(coverages):
+        raise ValueError("ages, genders and coverages must have the same length.")
+    if not len(ages):
+        return {"premiums": []}
+    return {"premiums": calculate_premium_batch(ages, genders, coverages).tolist()}
+
+# -----------------------------------------------------------------------------
+# HTTP/1.1 Server
+# -----------------------------------------------------------------------------
+class PricingService:
+    """
+    PricingService serves the pricing engine over HTTP/1.1 with keep-alive.
+    
+    Endpoints:
+        POST /quote  - price one applicant.
+        POST /batch  - price many applicants in one request.
+        GET  /health - liveness check.
+        GET  /metrics - stage metrics in Prometheus text format.
+    
+    Batch requests are parsed and priced in an executor, so the event loop
+    only moves bytes and stays responsive while large batches are priced.
+    Single quotes and tiny batches cost a few microseconds and are priced
+    inline, where the executor hand-off would dominate.
+    """
+    def __init__(self, executor=None):
+        self.executor = executor or ThreadPoolExecutor()
+    
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                keep_alive = await self.handle_request(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def handle_request(self, request_line: bytes, reader, writer) -> bool:
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            self.respond(writer, 400, {"error": "Malformed request line."}, keep_alive=False)
+            return False
+        
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            keep_alive = connection == "keep-alive"
+        else:
+            keep_alive = connection != "close"
+        
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            self.respond(writer, 400, {"error": "Invalid Content-Length."}, keep_alive=False)
+            return False
+        if length < 0:
+            self.respond(writer, 400, {"error": "Invalid Content-Length."}, keep_alive=False)
+            return False
+        if length > MAX_BODY_BYTES:
+            self.respond(writer, 413, {"error": "Request body too large."}, keep_alive=False)
+            return False
+        body = await reader.readexactly(length) if length else b""
+        
+        try:
+            status, payload = await self.dispatch(method, target.split("?", 1)[0], body)
+        except HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+        except ValueError as e:  # includes json.JSONDecodeError
+            status, payload = 400, {"error": str(e)}
+        except Exception:
+            logging.error("Unhandled error while pricing", exc_info=True)
+            status, payload = 500, {"error": "Internal server error."}
+        self.respond(writer, status, payload, keep_alive)
+        return keep_alive
+    
+    async def dispatch(self, method: str, path: str, body: bytes):
+        if path == "/quote":
+            if method != "POST":
+                raise HTTPError(405, "Use POST.")
+            return 200, price_quote(body)
+        if path == "/batch":
+            if method != "POST":
+                raise HTTPError(405, "Use POST.")
+            if len(body) <= INLINE_MAX_BYTES:
+                return 200, price_batch(body)
+            loop = asyncio.get_running_loop()
+            return 200, await loop.run_in_executor(self.executor, price_batch, body)
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/metrics":
+            return 200, METRICS.to_prometheus()
+        raise HTTPError(404, f"No such endpoint: {path}")
+    
+    def respond(self, writer, status: int, payload, keep_alive: bool):
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Error')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+    
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        logging.info(f"Pricing service listening on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+# -----------------------------------------------------------------------------
+# Main Execution
+# -----------------------------------------------------------------------------
+def main(argv=None):
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON premium pricing service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="Executor threads for batch pricing")
+    parser.add_argument("--metrics", action="store_true", help="Collect stage metrics for GET /metrics")
+    args = parser.parse_args(argv)
+    if args.metrics:
+        METRICS.enabled = True
+    
+    service = PricingService(ThreadPoolExecutor(max_workers=args.workers))
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,387 @@
+"""
+Lazy folder queries with the step vocabulary of read_folder.txt.
+
+A Query records Power Query steps without running them:
+
+    query = (folder_files("landing")                                 # Folder.Files
+             .select_rows(("Extension", "==", ".csv"))               # Table.SelectRows
+             .add_column("CSVData", csv_document(",", 1252))         # Table.AddColumn
+             .combine("CSVData")                                     # Table.Combine
+             .select_rows(("age", ">=", 30))
+             .select_columns(["policy_id", "age", "gender"])
+             .distinct())                                            # Table.Distinct
+    print(query.explain())
+    table = query.collect()
+
+optimize() compiles the steps into a Plan that runs as one pass per file.
+The extension filter moves into the folder scan, and, when the query ends
+in Distinct, byte-identical files are skipped. Row filters and the
+column selection move into the CSV parse. Added columns and the remaining
+filters run per file before the combine. Only Distinct, and any column
+selection after it, sees the combined table. collect() buffers the
+combined table in memory or streams it through the spilling Distinct,
+depending on how large the input is.
+"""
+import logging
+import os
+import pandas as pd
+
+from distinct import DEFAULT_MEMORY_BUDGET, KEEP_OPTIONS, distinct_rows, external_distinct
+from dtype_inference import apply_dtypes, infer_dtypes
+from duplicate_files import unique_files
+from fast_csv import DEFAULT_DELIMITER
+from filters import apply_filters, filter_columns, filter_mask, normalize_filters
+from metrics import METRICS
+from read_folder import combine_tables, list_folder_files, parse_files, resolve_dialect
+
+# Columns of the Folder.Files table that file-level filters can use.
+FILE_COLUMNS = ("Name", "Extension", "Folder Path", "Size")
+# Rough ratio of a parsed text table's memory to its CSV size, used to
+# decide whether a query's combined table fits its memory budget.
+IN_MEMORY_EXPANSION = 8
+
+# -----------------------------------------------------------------------------
+# Step Arguments
+# -----------------------------------------------------------------------------
+class CsvDocument:
+    """
+    CsvDocument holds the options of a Csv.Document step. Only
+    QuoteStyle.None is supported, and headers are always promoted.
+
+    Attributes:
+        delimiter (str): Field delimiter, or "auto".
+        encoding (str): Python codec name, or "auto".
+    """
+    def __init__(self, delimiter: str = DEFAULT_DELIMITER, encoding=1252):
+        self.delimiter = delimiter
+        # M names encodings by Windows code page (1252, 65001 = UTF-8).
+        self.encoding = f"cp{encoding}" if isinstance(encoding, int) else encoding
+
+    def __repr__(self) -> str:
+        return f"Csv.Document(delimiter={self.delimiter!r}, encoding={self.encoding!r})"
+
+def csv_document(delimiter: str = DEFAULT_DELIMITER, encoding=1252) -> CsvDocument:
+    """Returns the Csv.Document column value for Query.add_column."""
+    return CsvDocument(delimiter, encoding)
+
+# -----------------------------------------------------------------------------
+# Physical Plan
+# -----------------------------------------------------------------------------
+class Plan:
+    """
+    Plan is an optimized query: a filtered folder scan, one fused
+    parse-and-transform pass per file, then Combine and Distinct.
+
+    Attributes:
+        folder_path (str): Folder to scan.
+        ext (str): Extension filter applied during the scan (None for all files).
+        file_filters (list): Remaining filters on the Folder.Files table.
+        document (CsvDocument): How each file is parsed.
+        columns (list): Columns the parser keeps (None for all).
+        parse_filters (list): Row filters applied by the parser.
+        file_ops (list): Steps run on each parsed file before the combine.
+        distinct (bool): Whether duplicate rows are removed.
+        keys (list): Columns that identify a duplicate (None for all).
+        keep (str): Which row of each key survives, 'first' or 'last'.
+        order_by (str): Column deciding first and last (None for file order).
+        output_ops (list): Steps run on the de-duplicated output.
+    """
+    def __init__(self, folder_path: str):
+        self.folder_path = folder_path
+        self.ext = None
+        self.file_filters = []
+        self.document = None
+        self.columns = None
+        self.parse_filters = []
+        self.file_ops = []
+        self.distinct = False
+        self.keys = None
+        self.keep = "first"
+        self.order_by = None
+        self.output_ops = []
+
+    def explain(self) -> str:
+        """Returns a readable description of the plan, one line per stage."""
+        lines = [f"Scan      {self.folder_path} ext={self.ext!r}"]
+        if self.file_filters:
+            lines.append(f"  files   {self.file_filters}")
+        if self.distinct and self.keep == "first":
+            lines.append("  skip    byte-identical files")
+        lines.append(f"Parse     {self.document!r}")
+        if self.columns is not None:
+            lines.append(f"  columns {self.columns}")
+        if self.parse_filters:
+            lines.append(f"  filters {self.parse_filters}")
+        lines.extend(f"Per file  {_describe(op)}" for op in self.file_ops)
+        lines.append("Combine")
+        if self.distinct:
+            lines.append(f"Distinct  keys={self.keys!r} keep={self.keep!r} order_by={self.order_by!r}"
+                         " (in memory, or spilling to disk above the memory budget)")
+        lines.extend(f"Output    {_describe(op)}" for op in self.output_ops)
+        return "\n".join(lines)
+
+def _describe(op: tuple) -> str:
+    kind, arg = op[0], op[-1]
+    if kind == "add_column":
+        return f"add_column({op[1]!r})"
+    return f"{kind}({arg!r})"
+
+def _apply_ops(table: pd.DataFrame, ops: list) -> pd.DataFrame:
+    """Run row-wise steps on one table."""
+    for op in ops:
+        if op[0] == "add_column":
+            table = table.assign(**{op[1]: op[2](table)})
+        elif op[0] == "select_rows":
+            table = apply_filters(table, op[1])
+        else:
+            table = table[[name for name in op[1] if name in table.columns]]
+    return table
+
+# -----------------------------------------------------------------------------
+# Lazy Query
+# -----------------------------------------------------------------------------
+class Query:
+    """
+    Query is an immutable list of Power Query steps over a folder. Each step
+    method returns a new Query; nothing is read until collect() or
+    iter_collect().
+
+    Steps before combine() act on the Folder.Files table (one row per file,
+    with the FILE_COLUMNS columns); steps after it act on the combined rows.
+    Functions passed to add_column after combine() take a table and return
+    the new column's values; they must compute each row from that row alone,
+    so they can run per file.
+    """
+    def __init__(self, folder_path: str, steps: tuple = ()):
+        self.folder_path = folder_path
+        self.steps = steps
+
+    def _then(self, *step) -> "Query":
+        return Query(self.folder_path, self.steps + (step,))
+
+    @property
+    def combined(self) -> bool:
+        return any(step[0] == "combine" for step in self.steps)
+
+    def select_rows(self, *filters) -> "Query":
+        """Table.SelectRows: keep rows matching every (column, op, value) filter."""
+        filters = normalize_filters(filters)
+        if not self.combined:
+            unknown = [name for name in filter_columns(filters) if name not in FILE_COLUMNS]
+            if unknown:
+                raise ValueError(f"Folder.Files has no column(s) {unknown}; use one of {list(FILE_COLUMNS)}")
+        return self._then("select_rows", filters)
+
+    def add_column(self, name: str, value) -> "Query":
+        """
+        Table.AddColumn. Before combine() the value must be a csv_document();
+        after it, a function from a table to the new column's values.
+        """
+        if not self.combined:
+            if not isinstance(value, CsvDocument):
+                raise ValueError("Only a csv_document() column can be added to the Folder.Files table.")
+            if any(step[0] == "add_column" for step in self.steps):
+                raise ValueError("The Folder.Files table already has a Csv.Document column.")
+        elif not callable(value):
+            raise ValueError(f"Column {name!r} needs a function of the table.")
+        return self._then("add_column", name, value)
+
+    def combine(self, column: str = "CSVData") -> "Query":
+        """Table.Combine: union the tables of a Csv.Document column."""
+        if self.combined:
+            raise ValueError("The query is already combined.")
+        if not any(step[0] == "add_column" and step[1] == column for step in self.steps):
+            raise ValueError(f"No Csv.Document column named {column!r} to combine.")
+        return self._then("combine", column)
+
+    def select_columns(self, columns: list) -> "Query":
+        """Table.SelectColumns: keep these columns, in this order."""
+        if not self.combined:
+            raise ValueError("select_columns applies to the combined table; call combine() first.")
+        return self._then("select_columns", list(columns))
+
+    def distinct(self, columns: list = None, keep: str = "first", order_by: str = None) -> "Query":
+        """
+        Table.Distinct: remove duplicate rows, comparing all columns or only
+        the given key columns (see distinct.distinct_rows for keep and order_by).
+        """
+        if not self.combined:
+            raise ValueError("distinct applies to the combined table; call combine() first.")
+        if any(step[0] == "distinct" for step in self.steps):
+            raise ValueError("The query already has a distinct() step.")
+        if keep not in KEEP_OPTIONS:
+            raise ValueError(f"keep must be one of {KEEP_OPTIONS}, not {keep!r}")
+        return self._then("distinct", None if columns is None else list(columns), keep, order_by)
+
+    def optimize(self) -> Plan:
+        """
+        Compile the steps into a Plan.
+
+        Steps before Distinct run per file, and filters on source columns run
+        inside the parser. A column selection before Distinct becomes the
+        parser's projection, unless a function column was added before it
+        (the function may read any column). After a full-row Distinct, filters
+        on source columns still move into the parser, since filtering commutes
+        with it. Other steps after Distinct stay after it: a key-based
+        Distinct picks different rows once rows are filtered, a selection
+        changes which rows are duplicates, and an added column may replace a
+        column Distinct compared.
+        """
+        if not self.combined:
+            raise ValueError("The query has no combine() step to produce rows.")
+        plan = Plan(self.folder_path)
+        steps = iter(self.steps)
+        for step in steps:
+            if step[0] == "select_rows":
+                for column, op, value in step[1]:
+                    if column == "Extension" and op == "==" and plan.ext is None:
+                        plan.ext = value  # fused into the folder scan
+                    else:
+                        plan.file_filters.append((column, op, value))
+            elif step[0] == "add_column":
+                plan.document = step[2]
+            else:
+                break  # combine
+
+        derived = set()
+        kept = None  # column set after the latest select_columns
+        for step in steps:
+            kind = step[0]
+            ops = plan.output_ops if plan.distinct else plan.file_ops
+            if kind == "select_rows":
+                missing = [name for name in filter_columns(step[1]) if kept is not None and name not in kept]
+                if missing:
+                    raise ValueError(f"Filter on column(s) {missing} removed by select_columns.")
+                if plan.distinct and plan.keys is not None:
+                    ops.append(step)
+                    continue
+                pushed = [item for item in step[1] if item[0] not in derived]
+                plan.parse_filters.extend(pushed)
+                if len(pushed) < len(step[1]):
+                    ops.append(("select_rows", [item for item in step[1] if item[0] in derived]))
+            elif kind == "add_column":
+                derived.add(step[1])
+                kept = None if kept is None else kept | {step[1]}
+                ops.append(step)
+            elif kind == "select_columns":
+                if not plan.distinct and plan.columns is None and not derived:
+                    plan.columns = step[1]
+                ops.append(step)
+                kept = set(step[1])
+            else:
+                plan.distinct = True
+                plan.keys, plan.keep, plan.order_by = step[1:]
+        return plan
+
+    def explain(self) -> str:
+        """Returns the optimized plan as text."""
+        return self.optimize().explain()
+
+    def _scan(self, plan: Plan) -> list:
+        with METRICS.stage("folder_list") as timer:
+            paths = list_folder_files(plan.folder_path, plan.ext)
+            if plan.file_filters:
+                files = pd.DataFrame({
+                    "Name": [os.path.basename(path) for path in paths],
+                    "Extension": [os.path.splitext(path)[1] for path in paths],
+                    "Folder Path": [os.path.dirname(path) + os.sep for path in paths],
+                })
+                if "Size" in filter_columns(plan.file_filters):
+                    files["Size"] = [os.path.getsize(path) for path in paths]
+                keep = filter_mask(files, plan.file_filters)
+                paths = [path for path, kept in zip(paths, keep) if kept]
+            timer.rows = len(paths)
+        if plan.distinct and plan.keep == "first":
+            paths = unique_files(paths)
+        logging.info(f"Query scan found {len(paths)} files in {plan.folder_path}")
+        return paths
+
+    def _file_tables(self, plan: Plan, paths: list, max_workers: int, cache_dir: str):
+        encoding, delimiter = resolve_dialect(paths, plan.document.encoding, plan.document.delimiter)
+        tables = parse_files(paths, max_workers, encoding, delimiter, cache_dir,
+                             plan.columns, plan.parse_filters)
+        for table in tables:
+            yield _apply_ops(table, plan.file_ops)
+
+    def iter_collect(self, max_workers: int = None, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                     spill_dir: str = None, cache_dir: str = None):
+        """
+        Run the query in streaming mode, yielding the result in chunks.
+
+        Without distinct() each file's table is yielded as soon as it is
+        parsed. With distinct() rows go through the spilling Distinct (see
+        distinct.external_distinct), so memory stays bounded by memory_budget.
+        Chunk order is not guaranteed once Distinct has spilled.
+        """
+        plan = self.optimize()
+        tables = self._file_tables(plan, self._scan(plan), max_workers, cache_dir)
+        if plan.distinct:
+            tables = external_distinct(tables, memory_budget=memory_budget, spill_dir=spill_dir,
+                                       keys=plan.keys, keep=plan.keep, order_by=plan.order_by)
+        for table in tables:
+            yield _apply_ops(table, plan.output_ops)
+
+    def collect(self, max_workers: int = None, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                spill_dir: str = None, cache_dir: str = None, streaming: bool = None,
+                compact: bool = False, float32=False) -> pd.DataFrame:
+        """
+        Run the query and return the result as one table.
+
+        Parameters:
+            max_workers (int): Number of parser processes (default: CPU count).
+            memory_budget (int): Bytes the combined table may use in memory.
+            spill_dir (str): Directory for Distinct spill files.
+            cache_dir (str): Manifest cache directory for incremental parsing.
+            streaming (bool): Force streaming (True) or in-memory (False)
+                execution. By default the query streams when the estimated
+                parsed size of its files exceeds memory_budget.
+            compact (bool): Convert columns to compact dtypes inferred across
+                all files (see dtype_inference). In memory the per-file tables
+                are converted before the combine, so Distinct compares the
+                converted values; when streaming, the output is converted.
+            float32 (bool or list): With compact, allow float32 for every
+                fractional column (True) or for the listed columns.
+
+        Returns:
+            pd.DataFrame: The query result.
+        """
+        plan = self.optimize()
+        paths = self._scan(plan)
+        if streaming is None:
+            estimate = sum(os.path.getsize(path) for path in paths) * IN_MEMORY_EXPANSION
+            streaming = plan.distinct and estimate > memory_budget
+        logging.info(f"Running query {'streaming' if streaming else 'in memory'}")
+        tables = self._file_tables(plan, paths, max_workers, cache_dir)
+        if streaming:
+            if plan.distinct:
+                tables = external_distinct(tables, memory_budget=memory_budget, spill_dir=spill_dir,
+                                           keys=plan.keys, keep=plan.keep, order_by=plan.order_by)
+            tables = [_apply_ops(table, plan.output_ops) for table in tables]
+            if compact:
+                dtypes = infer_dtypes(tables, float32)
+                tables = [apply_dtypes(table, dtypes) for table in tables]
+            return combine_tables(tables)
+        tables = list(tables)
+        if compact:
+            with METRICS.stage("folder_dtypes", rows=sum(len(table) for table in tables)):
+                dtypes = infer_dtypes(tables, float32)
+                tables = [apply_dtypes(table, dtypes) for table in tables]
+        with METRICS.stage("folder_combine") as timer:
+            combined = combine_tables(tables)
+            timer.rows = len(combined)
+        if plan.distinct:
+            with METRICS.stage("folder_distinct", rows=len(combined)):
+                combined = distinct_rows(combined, plan.keys, plan.keep, plan.order_by)
+        return _apply_ops(combined, plan.output_ops)
+
+def folder_files(folder_path: str) -> Query:
+    """Folder.Files: start a query over every file under a folder."""
+    return Query(folder_path)
+
+def read_folder_query(folder_path: str, ext: str = ".csv") -> Query:
+    """Returns read_folder.txt as a Query."""
+    return (folder_files(folder_path)
+            .select_rows(("Extension", "==", ext))
+            .add_column("CSVData", csv_document(",", 1252))
+            .combine("CSVData")
+            .distinct())
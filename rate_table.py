@@ -0,0 +1,205 @@
+import bisect
+import csv
+import os
+
+# -----------------------------------------------------------------------------
+# Rate Table Configuration
+# -----------------------------------------------------------------------------
+DEFAULT_RATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rates.csv")
+
+# -----------------------------------------------------------------------------
+# Compiled Rate Table (Model)
+# -----------------------------------------------------------------------------
+def _batch_values(values, name: str) -> "np.ndarray":
+    """Returns batch input as a one-dimensional float64 array, raising ValueError otherwise."""
+    import numpy as np
+    
+    try:
+        values = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be numbers.") from None
+    if values.ndim != 1:
+        raise ValueError(f"{name} must be a one-dimensional array.")
+    return values
+
+class RateTable:
+    """
+    RateTable holds premium rates by gender and age band, compiled for fast lookup.
+    
+    Each gender is assigned an integer code. The age bands of every gender are
+    compiled into a sorted array of breakpoints, so finding the band for an age
+    is a binary search rather than an if/elif ladder. For vectorized lookups the
+    breakpoints of all genders are merged into one array and the rates are laid
+    out as a (gender, band) matrix, so a whole batch costs a single searchsorted.
+    Those NumPy tables are built on the first batch lookup.
+    """
+    def __init__(self, bands: dict):
+        """
+        Parameters:
+            bands (dict): Maps each gender to a list of (min_age, rate) pairs.
+                A band applies from its min_age up to the next band's min_age;
+                the first band also covers all younger ages.
+        """
+        self.genders = []
+        self.gender_codes = {}
+        self.breakpoints = []
+        self.rates = []
+        
+        for gender, gender_bands in bands.items():
+            gender = gender.strip().lower()
+            if gender in self.gender_codes:
+                raise ValueError(f"Duplicate gender in rate table: {gender}")
+            gender_bands = sorted((float(age), float(rate)) for age, rate in gender_bands)
+            if not gender_bands:
+                raise ValueError(f"No age bands defined for gender: {gender}")
+            min_ages = [age for age, _ in gender_bands]
+            if len(set(min_ages)) != len(min_ages):
+                raise ValueError(f"Duplicate age band for gender: {gender}")
+            
+            self.gender_codes[gender] = len(self.genders)
+            self.genders.append(gender)
+            # Band i covers ages in [breakpoints[i - 1], breakpoints[i]).
+            self.breakpoints.append(min_ages[1:])
+            self.rates.append([rate for _, rate in gender_bands])
+        
+        if not self.genders:
+            raise ValueError("Rate table is empty.")
+        self._batch_tables = None
+    
+    def _compiled_batch_tables(self):
+        """
+        Returns the merged breakpoint array and (gender, band) rate matrix,
+        building them with NumPy on first use so scalar-only callers never
+        import it.
+        """
+        if self._batch_tables is None:
+            import numpy as np
+            
+            # Merge every gender's breakpoints so a batch needs a single search.
+            merged = sorted({age for points in self.breakpoints for age in points})
+            lower_bounds = [float("-inf")] + merged
+            self._batch_tables = (
+                np.array(merged, dtype=np.float64),
+                np.array([
+                    [rates[bisect.bisect_right(points, age)] for age in lower_bounds]
+                    for points, rates in zip(self.breakpoints, self.rates)
+                ], dtype=np.float64),
+            )
+        return self._batch_tables
+    
+    @classmethod
+    def from_csv(cls, path: str) -> "RateTable":
+        """
+        Load a rate table from a CSV file with 'gender', 'min_age' and 'rate' columns.
+        
+        Parameters:
+            path (str): Path to the rate file.
+            
+        Returns:
+            RateTable: The compiled rate table.
+        """
+        bands = {}
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                bands.setdefault(row["gender"].strip().lower(), []).append(
+                    (row["min_age"], row["rate"])
+                )
+        return cls(bands)
+    
+    def gender_code(self, gender: str) -> int:
+        """Returns the integer code of a gender label, ignoring case."""
+        try:
+            return self.gender_codes[gender.lower()]
+        except KeyError:
+            raise ValueError("Invalid gender provided.") from None
+    
+    def encode_genders(self, genders) -> "np.ndarray":
+        """
+        Convert gender labels (or integer codes) to an array of integer codes.
+        
+        Only the distinct labels are lower-cased and looked up, so encoding
+        costs one pass over the data regardless of table size. Categorical
+        input reuses its category codes without materializing the labels.
+        """
+        import numpy as np
+        
+        if getattr(getattr(genders, "dtype", None), "name", None) == "category":
+            # Categorical input (e.g. pandas): look up each category once and
+            # gather through the existing integer codes.
+            categorical = getattr(genders, "cat", genders)
+            label_codes = np.array(
+                [self.gender_codes.get(str(label).lower(), -1) for label in categorical.categories] + [-1],
+                dtype=np.intp,
+            )
+            codes = label_codes[np.asarray(categorical.codes)]  # missing values (-1) map to -1
+            if codes.size and codes.min() < 0:
+                raise ValueError("Invalid gender provided.")
+            return codes
+        genders = np.asarray(genders)
+        if np.issubdtype(genders.dtype, np.integer):
+            if genders.size and (genders.min() < 0 or genders.max() >= len(self.genders)):
+                raise ValueError("Invalid gender provided.")
+            return genders.astype(np.intp, copy=False)
+        labels, inverse = np.unique(genders.astype(str), return_inverse=True)
+        label_codes = np.array([self.gender_code(label) for label in labels], dtype=np.intp)
+        return label_codes[inverse.reshape(genders.shape)]
+    
+    def age_bands(self, gender: str) -> list:
+        """
+        Returns the age bands of a gender as (min_age, max_age, rate) tuples.
+        
+        A band covers min_age <= age < max_age; the first band has no
+        min_age and the last no max_age (None), as they are open-ended.
+        """
+        code = self.gender_code(gender)
+        points = self.breakpoints[code]
+        return list(zip([None] + points, points + [None], self.rates[code]))
+    
+    def rate(self, age: float, gender: str) -> float:
+        """Returns the rate for a single applicant."""
+        code = self.gender_code(gender)
+        return self.rates[code][bisect.bisect_right(self.breakpoints[code], age)]
+    
+    def rates_for(self, ages, genders) -> "np.ndarray":
+        """
+        Returns the rates for arrays of ages and genders (labels or codes).
+        
+        Ages are converted to float64 first, so text that is not a number
+        raises instead of being compared as text; missing (NaN) ages and
+        arrays that are not one-dimensional are rejected.
+        """
+        import numpy as np
+        
+        breakpoints, rate_matrix = self._compiled_batch_tables()
+        ages = _batch_values(ages, "ages")
+        if np.isnan(ages).any():
+            raise ValueError("Invalid age provided.")
+        codes = self.encode_genders(genders)
+        bands = np.searchsorted(breakpoints, ages, side="right")
+        return rate_matrix[codes, bands]
+    
+    def premium(self, age: float, gender: str, coverage: float) -> float:
+        """Returns the premium for a single applicant."""
+        return coverage * self.rate(age, gender)
+    
+    def premiums(self, ages, genders, coverages) -> "np.ndarray":
+        """Returns the premiums for arrays of ages, genders and coverages."""
+        import numpy as np
+        
+        return _batch_values(coverages, "coverages") * self.rates_for(ages, genders)
+
+# -----------------------------------------------------------------------------
+# Shared Default Table
+# -----------------------------------------------------------------------------
+_default_table = None
+
+def get_rate_table() -> RateTable:
+    """
+    Returns the shared rate table, loading it from DEFAULT_RATES_PATH on first use.
+    
+    The path can be overridden with the PQUERY_RATES environment variable.
+    """
+    global _default_table
+    if _default_table is None:
+        _default_table = RateTable.from_csv(os.environ.get("PQUERY_RATES", DEFAULT_RATES_PATH))
+    return _default_table
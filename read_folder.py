@@ -0,0 +1,404 @@
+import argparse
+import logging
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import pandas as pd
+
+from combine import combine_tables
+from distinct import DEFAULT_MEMORY_BUDGET, distinct_rows, external_distinct
+from dtype_inference import apply_dtypes, infer_dtypes
+from duplicate_files import iter_unique_files, unique_files
+from fast_csv import DEFAULT_DELIMITER, DEFAULT_ENCODING, detect_dialect, read_unquoted_csv
+from filters import apply_filters, filter_columns, normalize_filters, parse_filter
+from folder_scan import DEFAULT_SCAN_WORKERS, iter_folder_entries
+from manifest import FileManifest, file_fingerprint
+from metrics import METRICS
+
+# CSV dialect used by read_folder.txt: Csv.Document(..., [Delimiter = ",",
+# Encoding = 1252, QuoteStyle = QuoteStyle.None]) followed by Table.PromoteHeaders.
+# Pass "auto" as the encoding or delimiter to detect it from the first file.
+AUTO = "auto"
+# Most files per worker task, and the chunk size when the paths arrive from
+# a scan still in progress.
+STREAM_CHUNKSIZE = 8
+# Worker tasks kept in flight per process. Finished tables wait in the parent
+# until they are consumed, so this window bounds the memory they take up.
+TASKS_PER_WORKER = 2
+
+# -----------------------------------------------------------------------------
+# Folder-Combine Pipeline (Python port of read_folder.txt)
+# -----------------------------------------------------------------------------
+def list_folder_files(folder_path: str, ext: str, pattern: str = None,
+                      scan_workers: int = DEFAULT_SCAN_WORKERS) -> list:
+    """
+    List the files under a folder (recursively, like Folder.Files) with a given extension.
+    
+    The tree is walked concurrently and filtered during the walk (see
+    folder_scan.iter_folder_entries).
+    
+    Parameters:
+        folder_path (str): Folder to search.
+        ext (str): File extension to keep, e.g. '.csv', or None for every
+            file. Matching ignores case.
+        pattern (str): Glob pattern file names must match (optional).
+        scan_workers (int): Number of scanning threads.
+        
+    Returns:
+        list: Sorted list of matching file paths.
+    """
+    return sorted(entry.path for entry in iter_folder_entries(folder_path, ext, pattern, scan_workers))
+
+def parse_csv_file(path: str, encoding: str = DEFAULT_ENCODING,
+                   delimiter: str = DEFAULT_DELIMITER, columns: list = None,
+                   filters: list = None) -> pd.DataFrame:
+    """
+    Parse one file the way Csv.Document + Table.PromoteHeaders does.
+    
+    Quotes are not interpreted and every value is kept as text, which lets
+    the quote-free fast path in fast_csv do the splitting. Projection and
+    filters are pushed into the parse: only the requested columns (plus any
+    the filters read) are converted, and filtered-out rows are dropped here,
+    before the table ever reaches the combine step.
+    
+    Parameters:
+        path (str): File to parse.
+        encoding (str): Text encoding of the file.
+        delimiter (str): Field delimiter.
+        columns (list): Columns to keep, in this order (default: all). Columns
+            missing from the file are left out.
+        filters (list): (column, op, value) row filters, combined with AND
+            (see filters.py).
+    """
+    usecols = None if columns is None else list(dict.fromkeys([*columns, *filter_columns(filters)]))
+    table = read_unquoted_csv(path, encoding, delimiter, usecols)
+    table = apply_filters(table, filters)
+    if columns is not None:
+        table = table[[name for name in columns if name in table.columns]]
+    return table
+
+def resolve_dialect(paths: list, encoding: str, delimiter: str):
+    """Replace an "auto" encoding or delimiter with the one detected in the first file."""
+    if paths and AUTO in (encoding, delimiter):
+        detected = detect_dialect(paths[0])
+        if detected["quoted"]:
+            logging.warning(f"{paths[0]} contains quotes; they are kept as data (QuoteStyle.None)")
+        if encoding == AUTO:
+            encoding = detected["encoding"]
+        if delimiter == AUTO:
+            delimiter = detected["delimiter"]
+        logging.info(f"Detected dialect: encoding={encoding}, delimiter={delimiter!r}")
+    return encoding, delimiter
+
+def _parse_with_fingerprint(path: str, encoding: str, delimiter: str, columns: list, filters: list):
+    """
+    Parse a file and fingerprint it in the same worker task.
+    
+    The fingerprint is taken before parsing, so a file modified during the
+    parse no longer matches it and is parsed again on the next run.
+    """
+    fingerprint = file_fingerprint(path)
+    table = parse_csv_file(path, encoding, delimiter, columns, filters)
+    return table, fingerprint
+
+def _map_chunk(func, paths: list, args: tuple) -> list:
+    """Run func(path, *args) over a chunk of paths inside one worker task."""
+    return [func(path, *args) for path in paths]
+
+def _map_files(func, paths, max_workers: int, *args):
+    """
+    Run func(path, *args) over paths in a process pool, in order.
+    
+    paths may be an iterator, such as a folder scan that is still running;
+    files are then handed to the workers as they arrive. Only
+    TASKS_PER_WORKER tasks per worker are submitted ahead of the consumer,
+    so a slow consumer (e.g. a spilling Distinct) holds at most that many
+    finished tables rather than the whole folder.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if isinstance(paths, list):
+        workers = min(workers, len(paths))
+        # Batch small files per task so scheduling overhead stays negligible.
+        chunksize = max(1, min(STREAM_CHUNKSIZE, len(paths) // (workers * 4)))
+    else:
+        chunksize = STREAM_CHUNKSIZE
+    if workers <= 1:
+        for path in paths:
+            yield func(path, *args)
+        return
+    paths = iter(paths)
+    chunks = iter(lambda: list(islice(paths, chunksize)), [])
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque(pool.submit(_map_chunk, func, chunk, args)
+                        for chunk in islice(chunks, workers * TASKS_PER_WORKER))
+        try:
+            while pending:
+                results = pending.popleft().result()
+                # Refill the window before handing results over, so the
+                # workers keep parsing while the consumer is busy.
+                for chunk in islice(chunks, 1):
+                    pending.append(pool.submit(_map_chunk, func, chunk, args))
+                yield from results
+        finally:
+            for future in pending:  # the consumer stopped early
+                future.cancel()
+
+def parse_files(paths: list, max_workers: int = None, encoding: str = DEFAULT_ENCODING,
+                delimiter: str = DEFAULT_DELIMITER, cache_dir: str = None,
+                columns: list = None, filters: list = None):
+    """
+    Parse files concurrently in a process pool, yielding the tables in path order.
+    
+    With a cache_dir, a FileManifest there records each file's size,
+    modification time and content hash together with its parsed table; only
+    new or modified files are parsed and the rest are loaded from the cache.
+    
+    Parameters:
+        paths (list): Files to parse. Without a cache_dir this may also be an
+            iterator of paths, which is consumed as parsing proceeds.
+        max_workers (int): Number of worker processes (default: CPU count).
+        encoding (str): Text encoding of the files.
+        delimiter (str): Field delimiter.
+        cache_dir (str): Directory of the incremental manifest cache (optional).
+        columns (list): Columns to keep (default: all).
+        filters (list): (column, op, value) row filters applied per file.
+        
+    Yields:
+        pd.DataFrame: One parsed table per file.
+    """
+    filters = normalize_filters(filters)
+    if cache_dir is None:
+        yield from METRICS.timed_iter(
+            _map_files(parse_csv_file, paths, max_workers, encoding, delimiter, columns, filters),
+            "folder_parse",
+        )
+        return
+    
+    options = {"encoding": encoding, "delimiter": delimiter}
+    if columns is not None:
+        options["columns"] = list(columns)
+    if filters:
+        options["filters"] = [list(item) for item in filters]
+    manifest = FileManifest(cache_dir, options)
+    paths = list(paths)
+    stale = [path for path in paths if not manifest.is_current(path)]
+    logging.info(f"Parsing {len(stale)} new or modified files; {len(paths) - len(stale)} cached")
+    parsed = METRICS.timed_iter(
+        _map_files(_parse_with_fingerprint, stale, max_workers, encoding, delimiter, columns, filters),
+        "folder_parse", rows=lambda item: len(item[0]),
+    )
+    stale = set(stale)
+    try:
+        for path in paths:
+            if path in stale:
+                table, fingerprint = next(parsed)
+                manifest.put(path, fingerprint, table)
+            else:
+                table = manifest.load(path)
+            yield table
+        manifest.prune(paths)
+    finally:
+        parsed.close()
+        manifest.save()
+
+def read_folder(folder_path: str, ext: str = ".csv", max_workers: int = None,
+                encoding: str = DEFAULT_ENCODING, delimiter: str = DEFAULT_DELIMITER,
+                cache_dir: str = None, columns: list = None, filters: list = None,
+                pattern: str = None, skip_duplicate_files: bool = True, keys: list = None,
+                keep: str = "first", order_by: str = None, compact: bool = False,
+                float32=False) -> pd.DataFrame:
+    """
+    Read, combine and de-duplicate every matching file in a folder.
+    
+    Files are parsed concurrently in a process pool; the combined table keeps
+    the files in path order and, by default, the first occurrence of each
+    duplicate row (see distinct.distinct_rows).
+    
+    Parameters:
+        folder_path (str): Folder to read.
+        ext (str): File extension to keep, e.g. '.csv'.
+        max_workers (int): Number of worker processes (default: CPU count).
+        encoding (str): Text encoding of the files, or "auto".
+        delimiter (str): Field delimiter, or "auto".
+        cache_dir (str): Directory of the incremental manifest cache; when
+            given, only new or modified files are parsed.
+        columns (list): Columns to keep (default: all). Duplicates are then
+            removed across these columns only.
+        filters (list): (column, op, value) row filters, pushed down into
+            each file's parse.
+        pattern (str): Glob pattern file names must match (optional).
+        skip_duplicate_files (bool): Skip files byte-identical to an earlier
+            file before parsing; their rows would be removed as duplicates.
+            Only done with keep='first', where a copy can never win.
+        keys (list): Columns that identify a duplicate (default: all columns).
+        keep (str): 'first' or 'last' row of each key to keep.
+        order_by (str): Column deciding which row is first or last, e.g. a
+            timestamp; by default file order decides. Its text is compared
+            as numbers or dates.
+        compact (bool): Convert columns to compact dtypes inferred across all
+            files (see dtype_inference) before the combine, instead of keeping
+            every value as text. Duplicates are then compared on the
+            converted values.
+        float32 (bool or list): With compact, allow float32 for every
+            fractional column (True) or for the listed columns.
+        
+    Returns:
+        pd.DataFrame: The combined table without duplicate rows.
+    """
+    with METRICS.stage("folder_list") as timer:
+        paths = list_folder_files(folder_path, ext, pattern)
+        timer.rows = len(paths)
+    logging.info(f"Found {len(paths)} '{ext}' files in {folder_path}")
+    if not paths:
+        return pd.DataFrame()
+    if skip_duplicate_files and keep == "first":
+        paths = unique_files(paths)
+    encoding, delimiter = resolve_dialect(paths, encoding, delimiter)
+    frames = list(parse_files(paths, max_workers, encoding, delimiter, cache_dir, columns, filters))
+    if compact:
+        with METRICS.stage("folder_dtypes", rows=sum(len(frame) for frame in frames)):
+            dtypes = infer_dtypes(frames, float32)
+            frames = [apply_dtypes(frame, dtypes) for frame in frames]
+    with METRICS.stage("folder_combine") as timer:
+        combined = combine_tables(frames)
+        timer.rows = len(combined)
+    with METRICS.stage("folder_distinct", rows=len(combined)):
+        return distinct_rows(combined, keys, keep, order_by)
+
+def iter_read_folder(folder_path: str, ext: str = ".csv", max_workers: int = None,
+                     memory_budget: int = DEFAULT_MEMORY_BUDGET, spill_dir: str = None,
+                     encoding: str = DEFAULT_ENCODING, delimiter: str = DEFAULT_DELIMITER,
+                     cache_dir: str = None, columns: list = None, filters: list = None,
+                     pattern: str = None, skip_duplicate_files: bool = True, keys: list = None,
+                     keep: str = "first", order_by: str = None):
+    """
+    Out-of-core variant of read_folder that yields the de-duplicated table in chunks.
+    
+    The Distinct step spills to disk once memory_budget bytes are buffered
+    (see distinct.external_distinct), so folders larger than RAM complete
+    with bounded memory. For a full-row Distinct without a cache_dir or
+    dialect detection, files are parsed while the folder scan is still
+    running; the set of rows does not depend on file order, only their
+    order in the output does. Key-based de-duplication reads the files in
+    path order, since which row of a key survives depends on it.
+    
+    Yields:
+        pd.DataFrame: Chunks of the combined table without duplicate rows.
+    """
+    if cache_dir is None and keys is None and AUTO not in (encoding, delimiter):
+        paths = METRICS.timed_iter(
+            (entry.path for entry in iter_folder_entries(folder_path, ext, pattern)),
+            "folder_list", rows=lambda path: 1,
+        )
+        if skip_duplicate_files and keep == "first":
+            paths = iter_unique_files(paths)
+        frames = parse_files(paths, max_workers, encoding, delimiter, None, columns, filters)
+        yield from external_distinct(frames, memory_budget=memory_budget, spill_dir=spill_dir,
+                                     keep=keep, order_by=order_by)
+        return
+    with METRICS.stage("folder_list") as timer:
+        paths = list_folder_files(folder_path, ext, pattern)
+        timer.rows = len(paths)
+    logging.info(f"Found {len(paths)} '{ext}' files in {folder_path}")
+    if skip_duplicate_files and keep == "first":
+        paths = unique_files(paths)
+    encoding, delimiter = resolve_dialect(paths, encoding, delimiter)
+    frames = parse_files(paths, max_workers, encoding, delimiter, cache_dir, columns, filters)
+    yield from external_distinct(frames, memory_budget=memory_budget, spill_dir=spill_dir,
+                                 keys=keys, keep=keep, order_by=order_by)
+
+# -----------------------------------------------------------------------------
+# Main Execution
+# -----------------------------------------------------------------------------
+def main(argv=None):
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Combine the CSV files in a folder (read_folder.txt)")
+    parser.add_argument("folder", help="Folder to read")
+    parser.add_argument("output", help="CSV file to write the combined table to")
+    parser.add_argument("--ext", default=".csv", help="File extension to read (default: %(default)s)")
+    parser.add_argument("--glob", default=None, help="Glob pattern file names must match, e.g. 'extract_*'")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parser processes")
+    parser.add_argument(
+        "--keep-duplicate-files", action="store_true",
+        help="Parse byte-identical files too instead of skipping them"
+    )
+    parser.add_argument(
+        "--encoding", default=DEFAULT_ENCODING,
+        help='Text encoding of the files, or "auto" to detect it (default: %(default)s)'
+    )
+    parser.add_argument(
+        "--delimiter", default=DEFAULT_DELIMITER,
+        help='Field delimiter, or "auto" to detect it (default: %(default)s)'
+    )
+    parser.add_argument(
+        "--memory-budget", type=int, default=None,
+        help="Bytes to buffer before the Distinct step spills to disk (default: in memory)"
+    )
+    parser.add_argument("--spill-dir", default=None, help="Directory for Distinct spill files")
+    parser.add_argument(
+        "--cache-dir", default=None,
+        help="Manifest cache directory; only new or modified files are re-parsed"
+    )
+    parser.add_argument(
+        "--columns", default=None, type=lambda text: [name.strip() for name in text.split(",")],
+        help="Comma-separated columns to keep; other columns are skipped while parsing"
+    )
+    parser.add_argument(
+        "--filter", dest="filters", action="append", default=[], type=parse_filter,
+        help="Row filter such as 'age>=30' or 'gender in Male,Female' (repeatable)"
+    )
+    parser.add_argument(
+        "--keys", default=None, type=lambda text: [name.strip() for name in text.split(",")],
+        help="Comma-separated columns that identify a duplicate (default: all columns)"
+    )
+    parser.add_argument(
+        "--keep", choices=["first", "last"], default="first",
+        help="Which row of each duplicate key to keep (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--order-by", default=None,
+        help="Column of numbers or dates (e.g. a timestamp) deciding which row is first or last; default is file order"
+    )
+    parser.add_argument(
+        "--metrics", default=None,
+        help="Write stage metrics to this file (Prometheus text if it ends in .prom, else JSON)"
+    )
+    args = parser.parse_args(argv)
+    if args.metrics:
+        METRICS.enabled = True
+    
+    try:
+        if args.memory_budget is None:
+            combined = read_folder(args.folder, args.ext, args.workers, args.encoding,
+                                   args.delimiter, args.cache_dir, args.columns, args.filters,
+                                   args.glob, not args.keep_duplicate_files, args.keys,
+                                   args.keep, args.order_by)
+            combined.to_csv(args.output, index=False)
+            total = len(combined)
+        else:
+            total = 0
+            chunks = iter_read_folder(args.folder, args.ext, args.workers,
+                                      args.memory_budget, args.spill_dir,
+                                      args.encoding, args.delimiter, args.cache_dir,
+                                      args.columns, args.filters, args.glob,
+                                      not args.keep_duplicate_files, args.keys,
+                                      args.keep, args.order_by)
+            with open(args.output, "w", newline="", encoding="utf-8") as out:
+                for i, chunk in enumerate(chunks):
+                    chunk.to_csv(out, header=(i == 0), index=False)
+                    total += len(chunk)
+    except (OSError, ValueError) as e:
+        logging.error(f"Folder combine failed: {e}")
+        return 1
+    logging.info(f"Wrote {total} rows to {args.output}")
+    if args.metrics:
+        METRICS.write(args.metrics)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
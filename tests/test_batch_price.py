@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from batch_price import price_csv
+from engine import calculate_premium_logic
+def write_policies(path, rows):
+    path.write_text("policy_id,age,gender,coverage\n" + "".join(f"{r}\n" for r in rows))
+
+def test_output_does_not_depend_on_chunk_size(tmp_path):
+    src = tmp_path / "in.csv"
+    # The first chunk holds only integer-looking values, the second decimals.
+    write_policies(src, ["1,30,Male,100000", "2,40,Female,200000", "3,50.5,Male,150000.25"])
+    outputs = []
+    for chunk_size in (1, 2, 10):
+        dst = tmp_path / f"out{chunk_size}.csv"
+        assert price_csv(str(src), str(dst), chunk_size=chunk_size) == 3
+        outputs.append(dst.read_text())
+    assert outputs[0] == outputs[1] == outputs[2]
+    lines = outputs[0].splitlines()
+    assert lines[1].startswith("1,30,Male,100000,")
+    assert lines[3].startswith("3,50.5,Male,150000.25,")
+
+def test_premiums_match_the_scalar_engine(tmp_path):
+    src, dst = tmp_path / "in.csv", tmp_path / "out.csv"
+    write_policies(src, ["1,30,Male,100000", "2,72,Female,619095.3"])
+    price_csv(str(src), str(dst))
+    out = pd.read_csv(dst, float_precision="round_trip")
+    assert out["premium"].tolist() == [
+        calculate_premium_logic(30, "Male", 100000),
+        calculate_premium_logic(72, "Female", 619095.3),
+    ]
+
+def test_blank_age_or_coverage_leaves_the_premium_blank(tmp_path, caplog):
+    src, dst = tmp_path / "in.csv", tmp_path / "out.csv"
+    write_policies(src, ["1,,Male,100000", "2,40,Female,", "3,30,Male,100000"])
+    with caplog.at_level("WARNING"):
+        assert price_csv(str(src), str(dst)) == 3
+    out = pd.read_csv(dst)
+    assert out["premium"].isna().tolist() == [True, True, False]
+    assert "2 policies have no age or coverage" in caplog.text
+
+def test_non_numeric_age_is_rejected(tmp_path):
+    src, dst = tmp_path / "in.csv", tmp_path / "out.csv"
+    write_policies(src, ["1,thirty,Male,100000"])
+    with pytest.raises(ValueError, match="must be numbers"):
+        price_csv(str(src), str(dst))
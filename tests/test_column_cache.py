@@ -0,0 +1,39 @@
+import os
+
+import pandas as pd
+
+from column_cache import META_NAME, ColumnCache, read_csv_cached, source_key
+
+def write_csv(path, rows):
+    path.write_text("a,b\n" + "".join(f"{i},x{i}\n" for i in range(rows)))
+    return str(path)
+
+def set_last_used(cache, key, seconds):
+    os.utime(os.path.join(cache.cache_dir, key, META_NAME), (seconds, seconds))
+
+def test_reopen_matches_the_parse(tmp_path):
+    path = write_csv(tmp_path / "a.csv", 5)
+    first = read_csv_cached(path, str(tmp_path / "cache"))
+    again = read_csv_cached(path, str(tmp_path / "cache"))
+    assert again.equals(first)
+    assert again.dtypes.tolist() == first.dtypes.tolist()
+
+def test_evict_removes_least_recently_used_tables(tmp_path):
+    cache = ColumnCache(str(tmp_path))
+    for i, key in enumerate(["old", "mid", "new"]):
+        cache.write(key, pd.DataFrame({"a": range(100)}))
+        set_last_used(cache, key, 1_000_000 + i)
+    assert cache.evict(2 * cache.size("new")) == ["old"]
+    assert sorted(cache.keys()) == ["mid", "new"]
+    assert cache.evict(0, keep=["mid"]) == ["new"]
+    assert cache.keys() == ["mid"]
+
+def test_read_csv_cached_keeps_the_cache_within_max_bytes(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    first = write_csv(tmp_path / "first.csv", 50)
+    second = write_csv(tmp_path / "second.csv", 50)
+    read_csv_cached(first, cache_dir)
+    cache = ColumnCache(cache_dir)
+    set_last_used(cache, source_key(first), 1_000_000)
+    read_csv_cached(second, cache_dir, max_bytes=cache.size(source_key(first)))
+    assert cache.keys() == [source_key(second)]
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from combine import combine_tables
+
+def frame(**columns) -> pd.DataFrame:
+    return pd.DataFrame({name: pd.Series(values, dtype=dtype) for name, (values, dtype) in columns.items()})
+
+CASES = {
+    "same_schema": [frame(a=(["x", "y"], "str"), b=([1, 2], "int64")), frame(a=(["z"], "str"), b=([3], "int64"))],
+    "missing_columns": [frame(a=(["x"], "str"), b=([1], "int64")), frame(b=([2], "int64"), c=([1.5], "float64"))],
+    "missing_bool_and_datetime": [frame(f=([True], "bool"), t=(["2024-01-01"], "datetime64[ns]")),
+                                  frame(u=([1], "int64"))],
+    "empty_table": [frame(a=([], "int64")), frame(b=(["x"], "str"))],
+    "int_and_float": [frame(a=([1], "int64")), frame(a=([2.5], "float32"))],
+    "number_and_text": [frame(a=([1], "int64")), frame(a=(["x"], "str"))],
+    "nullable_widening": [frame(a=([1, None], "Int8")), frame(a=([300], "Int16"))],
+    "nullable_and_numpy": [frame(a=([1, None], "Int8")), frame(a=([3], "int8"))],
+    "boolean_and_bool": [frame(a=([True, None], "boolean")), frame(a=([False], "bool"))],
+}
+
+@pytest.mark.parametrize("name", CASES)
+def test_matches_concat(name):
+    frames = CASES[name]
+    expected = pd.concat(frames, ignore_index=True, sort=False)
+    pd.testing.assert_frame_equal(combine_tables(frames), expected)
+
+@pytest.mark.parametrize("name, dtype", [
+    ("nullable_widening", "Int16"), ("nullable_and_numpy", "Int8"), ("boolean_and_bool", "boolean"),
+])
+def test_nullable_parts_keep_the_column_nullable(name, dtype):
+    assert combine_tables(CASES[name])["a"].dtype == dtype
+
+def test_categoricals_merge_their_categories():
+    combined = combine_tables([frame(g=(["M", "F"], "category")), frame(g=(["F", "X"], "category"))])
+    assert list(combined["g"].cat.categories) == ["F", "M", "X"]
+    assert combined["g"].tolist() == ["M", "F", "F", "X"]
+
+def test_no_tables():
+    assert combine_tables([]).empty
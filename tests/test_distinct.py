@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from distinct import distinct_rows, external_distinct
+
+def text_table(**columns) -> pd.DataFrame:
+    return pd.DataFrame(columns, dtype="str")
+
+def test_full_row_distinct_matches_drop_duplicates():
+    rng = np.random.default_rng(0)
+    table = text_table(a=rng.integers(0, 5, 500).astype(str), b=rng.integers(0, 5, 500).astype(str))
+    expected = table.drop_duplicates().reset_index(drop=True)
+    assert distinct_rows(table).equals(expected)
+
+@pytest.mark.parametrize("keep, values", [("first", ["1", "3"]), ("last", ["2", "4"])])
+def test_keyed_distinct_keeps_first_or_last_in_input_order(keep, values):
+    table = text_table(id=["a", "b", "a", "b"], value=["1", "3", "2", "4"])
+    result = distinct_rows(table, keys=["id"], keep=keep)
+    assert result["value"].tolist() == values
+    assert result["id"].tolist() == ["a", "b"]
+
+def test_order_by_compares_text_as_numbers():
+    table = text_table(id=["a", "a", "a", "b"], version=["9", "10", "", "2"])
+    assert distinct_rows(table, ["id"], "last", "version")["version"].tolist() == ["10", "2"]
+    assert distinct_rows(table, ["id"], "first", "version")["version"].tolist() == ["", "2"]
+
+def test_order_by_compares_text_as_dates():
+    table = text_table(id=["a", "a"], updated=["03/02/2024 10:00", "2024-01-15"])
+    assert distinct_rows(table, ["id"], "last", "updated")["updated"].tolist() == ["03/02/2024 10:00"]
+
+def test_order_by_rejects_other_text():
+    with pytest.raises(ValueError):
+        distinct_rows(text_table(id=["a", "a"], note=["x", "y"]), ["id"], "last", "note")
+
+def test_external_distinct_in_memory_matches_distinct_rows():
+    frames = [text_table(id=["a", "b"], version=["9", "1"]), text_table(id=["a"], version=["10"])]
+    result = pd.concat(list(external_distinct(frames, keys=["id"], keep="last", order_by="version")))
+    assert sorted(zip(result["id"], result["version"])) == [("a", "10"), ("b", "1")]
+
+def spill_frames(files: int = 10, rows: int = 300):
+    rng = np.random.default_rng(1)
+    return [text_table(id=rng.integers(0, 600, rows).astype(str),
+                       version=rng.integers(0, 50, rows).astype(str),
+                       note=np.repeat(f"note-{i}", rows))
+            for i in range(files)]
+
+def test_spill_path_matches_in_memory_distinct(tmp_path, monkeypatch):
+    import distinct
+    
+    frames = spill_frames()
+    budget = 50_000
+    loaded = []
+    in_memory = distinct.distinct_rows
+    
+    def record(table, *args):
+        loaded.append(distinct._frame_bytes(table))
+        return in_memory(table, *args)
+    
+    monkeypatch.setattr(distinct, "distinct_rows", record)
+    spilled = pd.concat(list(external_distinct(frames, memory_budget=budget, n_buckets=2,
+                                               spill_dir=str(tmp_path))))
+    expected = in_memory(pd.concat(frames, ignore_index=True))
+    assert sorted(map(tuple, spilled.to_numpy())) == sorted(map(tuple, expected.to_numpy()))
+    # Every bucket was re-split until it loads within the budget.
+    assert len(loaded) > 2
+    assert 2 * max(loaded) <= budget
+    assert list(tmp_path.iterdir()) == []
+
+def test_spill_path_with_keys_and_order_by(tmp_path):
+    frames = spill_frames()
+    spilled = pd.concat(list(external_distinct(frames, memory_budget=50_000, n_buckets=4,
+                                               spill_dir=str(tmp_path), keys=["id"], keep="last",
+                                               order_by="version")))
+    expected = distinct_rows(pd.concat(frames, ignore_index=True), ["id"], "last", "version")
+    assert sorted(map(tuple, spilled.to_numpy())) == sorted(map(tuple, expected.to_numpy()))
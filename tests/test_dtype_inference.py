@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dtype_inference import compact_dtypes, infer_dtypes
+from read_folder import read_folder
+
+def text_table(**columns) -> pd.DataFrame:
+    return pd.DataFrame(columns, dtype="str")
+
+def test_numbers_are_inferred_from_exact_text():
+    table = text_table(age=["30", "41", ""], coverage=["1000.5", "250000.0", "0.25"])
+    dtypes = infer_dtypes([table])
+    assert dtypes["age"] == "Int8"
+    assert dtypes["coverage"] == np.float64
+
+def test_text_that_does_not_round_trip_stays_text():
+    table = text_table(
+        code=["00123", "123", "7"],
+        decimals=["1.5", "1.50", "2.0"],
+        exponent=["1e3", "1000.0", "2.0"],
+        mixed=["1000", "1000.5", "2.5"],
+        signed=["+1", "2", "3"],
+    )
+    dtypes = infer_dtypes([table])
+    assert [col for col, dtype in dtypes.items() if dtype is not None] == []
+
+def test_whole_and_decimal_text_across_tables_stays_text():
+    assert infer_dtypes([text_table(x=["1000", "2"]), text_table(x=["1000.0", "2.5"])])["x"] is None
+
+def test_large_nullable_integers_are_exact():
+    table = compact_dtypes(text_table(big=["9007199254740993", "", "1"]))
+    assert table["big"].dtype == "Int64"
+    assert table["big"].tolist()[0] == 9007199254740993
+
+@pytest.mark.parametrize("values", [["1.5", "1.50", "1e3", "1000.0"], ["00123", "123"], ["1000", "1000.0"]])
+def test_compact_distinct_keeps_rows_that_differ_in_text(tmp_path, values):
+    (tmp_path / "a.csv").write_text("value\n" + "\n".join(values) + "\n", encoding="cp1252")
+    plain = read_folder(str(tmp_path), max_workers=1)
+    compact = read_folder(str(tmp_path), max_workers=1, compact=True)
+    assert len(plain) == len(compact) == len(values)
@@ -0,0 +1,24 @@
+from duplicate_files import PREFIX_BYTES, find_duplicate_files, iter_unique_files, unique_files
+
+def write(path, data: bytes) -> str:
+    path.write_bytes(data)
+    return str(path)
+
+def test_identical_files_are_duplicates(tmp_path):
+    first = write(tmp_path / "a.csv", b"age,gender\n30,Male\n")
+    copy = write(tmp_path / "b.csv", b"age,gender\n30,Male\n")
+    other = write(tmp_path / "c.csv", b"age,gender\n31,Male\n")
+    assert find_duplicate_files([first, copy, other]) == {copy: first}
+    assert unique_files([first, copy, other]) == [first, other]
+
+def test_shared_prefix_of_different_sizes_is_not_a_duplicate(tmp_path):
+    # A file exactly one prefix long and a longer file starting with the
+    # same bytes, each with a same-sized twin so both reach the prefix hash.
+    prefix = b"x" * PREFIX_BYTES
+    short = write(tmp_path / "short.csv", prefix)
+    short_copy = write(tmp_path / "short_copy.csv", prefix)
+    long = write(tmp_path / "long.csv", prefix + b"more rows\n")
+    long_other = write(tmp_path / "long_other.csv", prefix + b"also rows\n")
+    paths = [short, short_copy, long, long_other]
+    assert find_duplicate_files(paths) == {short_copy: short}
+    assert list(iter_unique_files(paths)) == [short, long, long_other]
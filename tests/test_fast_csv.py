@@ -0,0 +1,52 @@
+import csv
+
+import pandas as pd
+import pytest
+
+import fast_csv
+from fast_csv import read_unquoted_csv
+
+CASES = {
+    "lf": b"a,b\n1,2\n3,4\n",
+    "crlf": b"a,b\r\n1,2\r\n3,4\r\n",
+    "cr_only": b"a,b\r1,2\r3,4\r",
+    "cr_only_duplicate_header": b"a,a\r1,2\r",
+    "lone_cr_before_space": b"a,b\n1,2\r 3,4\n",
+    "blank_lines": b"a,b\n\n1,2\n\n\n3,4\n",
+    "whitespace_line": b"a\n1\n \n2\n",
+    "no_final_newline": b"a,b\n1,2",
+    "empty_fields": b"a,b\n,\n1,\n",
+    "quotes_are_data": b'a,b\n"x,2\n',
+    "trailing_delimiter": b"a,b,\n1,2,\n",
+    "duplicate_header": b"a,a\n1,2\n",
+    "ragged_rows": b"a,b,c\n1\n1,2,3\n",
+    "single_column_with_delimiter": b"a\n1,2\n3,4\n",
+    "utf8_bom": b"\xef\xbb\xbfa,b\n1,\xc3\xa9\n",
+}
+
+def read_with_pandas(path, usecols=None):
+    return pd.read_csv(path, sep=",", encoding="utf-8", quoting=csv.QUOTE_NONE,
+                       dtype=str, keep_default_na=False, usecols=usecols)
+
+@pytest.mark.parametrize("name", CASES)
+def test_matches_pandas(tmp_path, name):
+    path = tmp_path / f"{name}.csv"
+    path.write_bytes(CASES[name])
+    expected = read_with_pandas(path)
+    pd.testing.assert_frame_equal(read_unquoted_csv(str(path), "utf-8", ","), expected)
+
+def test_projection_matches_pandas(tmp_path):
+    path = tmp_path / "a.csv"
+    path.write_bytes(b"a,b,c\n1,2,3\n4,5,6\n")
+    expected = read_with_pandas(path, usecols=["c", "a"])
+    pd.testing.assert_frame_equal(read_unquoted_csv(str(path), "utf-8", ",", ["c", "a", "z"]), expected)
+
+def test_small_plain_files_take_the_splitter(tmp_path, monkeypatch):
+    path = tmp_path / "a.csv"
+    path.write_bytes(b"a;b\n1;x\n2;y\n")
+    monkeypatch.setattr(fast_csv, "pa", None)
+    monkeypatch.setattr(fast_csv, "_read_pandas", lambda *args: pytest.fail("fell back to pandas"))
+    assert read_unquoted_csv(str(path), "cp1252", ";").to_dict("list") == {"a": ["1", "2"], "b": ["x", "y"]}
+    monkeypatch.setattr(fast_csv, "SPLIT_MAX_BYTES", 8)
+    with pytest.raises(pytest.fail.Exception):
+        read_unquoted_csv(str(path), "cp1252", ";")
@@ -0,0 +1,45 @@
+import os
+
+import pandas as pd
+
+import read_folder
+from manifest import file_fingerprint
+from read_folder import parse_files
+
+def parse(paths, cache_dir, **options) -> pd.DataFrame:
+    return pd.concat(list(parse_files(paths, max_workers=1, cache_dir=str(cache_dir), **options)))
+
+def test_fingerprint_records_size_mtime_and_hash(tmp_path):
+    path = tmp_path / "a.csv"
+    path.write_text("a,b\n1,x\n")
+    fingerprint = file_fingerprint(str(path))
+    assert fingerprint["size"] == os.path.getsize(path)
+    assert fingerprint["mtime_ns"] == os.stat(path).st_mtime_ns
+    path.write_text("a,b\n2,x\n")
+    assert file_fingerprint(str(path))["hash"] != fingerprint["hash"]
+
+def test_cached_tables_are_keyed_by_parse_options(tmp_path):
+    path = tmp_path / "a.csv"
+    path.write_text("a,b\n1,x\n2,y\n3,z\n")
+    cache_dir = tmp_path / "cache"
+    assert parse([str(path)], cache_dir).shape == (3, 2)
+    for _ in range(2):  # parsed, then loaded from the cache
+        table = parse([str(path)], cache_dir, columns=["a"], filters=[("a", ">=", 2)])
+        assert table.columns.tolist() == ["a"]
+        assert table["a"].tolist() == ["2", "3"]
+
+def test_file_modified_during_parse_is_parsed_again(tmp_path, monkeypatch):
+    path = tmp_path / "a.csv"
+    path.write_text("a\n1\n")
+    cache_dir = tmp_path / "cache"
+    parse_csv_file = read_folder.parse_csv_file
+    
+    def parse_then_modify(*args):
+        table = parse_csv_file(*args)
+        path.write_text("a\n2\n")  # same size, new content and mtime
+        return table
+    
+    monkeypatch.setattr(read_folder, "parse_csv_file", parse_then_modify)
+    assert parse([str(path)], cache_dir)["a"].tolist() == ["1"]
+    monkeypatch.undo()
+    assert parse([str(path)], cache_dir)["a"].tolist() == ["2"]
@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+import pytest
+
+from engine import calculate_premium_logic
+from pricing_service import PricingService, price_batch, price_quote
+
+def body(payload) -> bytes:
+    return json.dumps(payload).encode("utf-8")
+
+def test_row_and_columnar_batches_agree():
+    ages, genders, coverages = [25, 29.9, 30, "45"], ["Male", "Female", "male", "Female"], [1000, 2000.5, 3000, 4000]
+    rows = price_batch(body({"applicants": [
+        {"age": age, "gender": gender, "coverage": coverage}
+        for age, gender, coverage in zip(ages, genders, coverages)
+    ]}))
+    columns = price_batch(body({"ages": ages, "genders": genders, "coverages": coverages}))
+    assert rows == columns
+    assert columns["premiums"] == [
+        calculate_premium_logic(float(age), gender, coverage)
+        for age, gender, coverage in zip(ages, genders, coverages)
+    ]
+
+@pytest.mark.parametrize("payload", [
+    {"ages": 5, "genders": ["Male"], "coverages": [1000]},
+    {"ages": [[30], [40]], "genders": ["Male", "Male"], "coverages": [1000, 1000]},
+    {"ages": ["thirty"], "genders": ["Male"], "coverages": [1000]},
+    {"ages": [30], "genders": ["Male"], "coverages": [float("nan")]},
+    {"ages": [30, 40], "genders": ["Male"], "coverages": [1000, 1000]},
+    {"applicants": [{"age": float("inf"), "gender": "Male", "coverage": 1000}]},
+    {"applicants": [{"age": 30, "gender": "Male", "coverage": float("nan")}]},
+])
+def test_invalid_batches_raise_value_error(payload):
+    with pytest.raises(ValueError):
+        price_batch(body(payload))
+
+@pytest.mark.parametrize("text", [b'{"age": 1e400, "gender": "Male", "coverage": 1000}',
+                                  b'{"age": 30, "gender": "Male", "coverage": NaN}'])
+def test_non_finite_quotes_raise_value_error(text):
+    with pytest.raises(ValueError):
+        price_quote(text)
+
+def request(raw: bytes) -> str:
+    async def exchange():
+        server = await asyncio.start_server(PricingService().handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return response.decode("latin-1")
+    return asyncio.run(exchange())
+
+def test_negative_content_length_gets_400():
+    response = request(b"POST /batch HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+    assert response.startswith("HTTP/1.1 400")
+
+def test_overflowing_age_gets_400():
+    payload = b'{"age": 1e400, "gender": "Male", "coverage": 1000}'
+    response = request(b"POST /quote HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s"
+                       % (len(payload), payload))
+    assert response.startswith("HTTP/1.1 400")
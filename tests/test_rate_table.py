@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from engine import calculate_premium_logic
+from rate_table import RateTable, get_rate_table
+
+def test_batch_rates_match_scalar_rates():
+    rates = get_rate_table()
+    ages = [18, 29, 29.9, 30, 49, 50, 100]
+    for gender in ("Male", "Female"):
+        batch = rates.rates_for(ages, [gender] * len(ages))
+        assert batch.tolist() == [rates.rate(age, gender) for age in ages]
+
+def test_text_ages_are_compared_as_numbers():
+    rates = get_rate_table()
+    text = rates.rates_for(["25", "30", "100", "9"], ["Male"] * 4)
+    assert text.tolist() == rates.rates_for([25, 30, 100, 9], ["Male"] * 4).tolist()
+
+@pytest.mark.parametrize("ages", [["thirty"], [30, None], [float("nan")], [[30], [40]]])
+def test_invalid_ages_raise(ages):
+    with pytest.raises(ValueError):
+        get_rate_table().rates_for(ages, ["Male"] * len(ages))
+
+def test_nested_coverages_raise():
+    with pytest.raises(ValueError):
+        get_rate_table().premiums([30, 40], ["Male", "Male"], [[1000], [2000]])
+
+def test_premiums_match_scalar_logic():
+    premiums = get_rate_table().premiums([25, 45, 65], ["Male", "Female", "Male"], [1000, 2000, 3000])
+    expected = [calculate_premium_logic(25, "Male", 1000), calculate_premium_logic(45, "Female", 2000),
+                calculate_premium_logic(65, "Male", 3000)]
+    assert premiums.tolist() == expected
+
+def test_bands_start_at_their_min_age():
+    rates = RateTable({"male": [(0, 0.01), (30, 0.02)]})
+    assert rates.rates_for(np.array([29, 30]), ["male", "male"]).tolist() == [0.01, 0.02]
+
+def test_age_bands_describe_the_table():
+    rates = RateTable({"male": [(0, 0.02), (30, 0.03), (50, 0.05)]})
+    assert rates.age_bands("Male") == [(None, 30.0, 0.02), (30.0, 50.0, 0.03), (50.0, None, 0.05)]
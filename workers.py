@@ -0,0 +1,75 @@
+import logging
+import threading
+import traceback
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+# -----------------------------------------------------------------------------
+# Background Jobs for the PyQt Front Ends
+# -----------------------------------------------------------------------------
+class JobCancelled(Exception):
+    """Raised inside a job function to stop after a cancellation request."""
+
+class JobSignals(QObject):
+    """
+    JobSignals carries a job's notifications back to the GUI thread.
+    
+    The signals are emitted from a pool thread; Qt queues them to slots of
+    objects living in the GUI thread, so handlers may touch widgets freely.
+    """
+    progress = pyqtSignal(int, int)  # (done, total); total 0 means indeterminate
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+
+class Job(QRunnable):
+    """
+    Job runs a function on the shared QThreadPool.
+    
+    The function is called as fn(*args, progress=..., is_cancelled=..., **kwargs).
+    It should call progress(done, total) as it goes, and check is_cancelled()
+    (or let the progress callback raise JobCancelled) between units of work.
+    """
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.setAutoDelete(False)  # the owner keeps the job alive until finished
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = JobSignals()
+        self._cancel_event = threading.Event()
+    
+    def cancel(self):
+        """Requests cancellation; the job stops at its next progress report."""
+        self._cancel_event.set()
+    
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+    
+    def report_progress(self, done: int, total: int):
+        if self.is_cancelled():
+            raise JobCancelled()
+        self.signals.progress.emit(int(done), int(total))
+    
+    def start(self, pool: QThreadPool = None):
+        """Queues the job on a thread pool (default: the global pool)."""
+        (pool or QThreadPool.globalInstance()).start(self)
+    
+    def run(self):
+        try:
+            result = self.fn(
+                *self.args, progress=self.report_progress, is_cancelled=self.is_cancelled, **self.kwargs
+            )
+        except JobCancelled:
+            logging.info("Background job cancelled.")
+            self.signals.cancelled.emit()
+        except Exception as e:
+            logging.error(f"Background job failed:\n{traceback.format_exc()}")
+            self.signals.error.emit(str(e))
+        else:
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()